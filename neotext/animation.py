@@ -0,0 +1,99 @@
+"""
+asyncio animation of NeoWrite: scrolls the text at a fixed frame rate and leaves
+the time in between to the other tasks of the event loop
+author: Sebastian Heiden
+"""
+
+import asyncio
+import time
+
+
+class Animator:
+    """
+    scrolls a NeoWrite one column per frame, every frame has its deadline start + n / fps
+    frames, whose deadline has already passed when it is their turn, are skipped: the text moves
+    on by the skipped columns, so its position only depends on the time and never drifts
+    """
+
+    def __init__(self, neo, fps=10.0, direction="LEFT"):
+        """
+        :type neo: NeoWrite display to animate
+        :type fps: float frames (columns) per second
+        :type direction: str LEFT or RIGHT
+        """
+        assert fps > 0.0
+        assert direction.upper() == "LEFT" or direction.upper() == "RIGHT"
+
+        self.neo = neo
+        self.fps = fps
+        self.step = - 1 if direction.upper() == "LEFT" else +1
+        self.running = False
+        self.reset_stats()
+
+    def reset_stats(self):
+        """
+        set all counters of stats() to 0
+        :return: None
+        """
+        self.frames_shown = 0
+        self.frames_skipped = 0
+        self.missed_deadlines = 0
+        self.jitter_sum = 0.0
+        self.jitter_max = 0.0
+
+    def stats(self):
+        """
+        statistics of the frames since the last reset_stats()
+        jitter is the delay of a frame behind its deadline in seconds
+        :return: dict
+        """
+        return {
+            "frames_shown": self.frames_shown,
+            "frames_skipped": self.frames_skipped,
+            "missed_deadlines": self.missed_deadlines,
+            "jitter_mean": self.jitter_sum / self.frames_shown if self.frames_shown else 0.0,
+            "jitter_max": self.jitter_max,
+        }
+
+    def stop(self):
+        """
+        let run() return after the current frame
+        :return: None
+        """
+        self.running = False
+
+    async def run(self, num_frames=None):
+        """
+        animate until stop() is called or num_frames frames (shown and skipped) are done
+        :type num_frames: int or None for no limit
+        :return: None
+        """
+        period = 1.0 / self.fps
+        deadline = time.monotonic()
+        frame = 0
+        self.running = True
+
+        while self.running and (num_frames is None or frame < num_frames):
+            # sleeps 0 s if the animation is behind, the other tasks get their turn anyway
+            await asyncio.sleep(max(deadline - time.monotonic(), 0.0))
+            now = time.monotonic()
+
+            lateness = now - deadline
+            skipped = int(lateness // period)
+            if num_frames is not None:
+                skipped = min(skipped, num_frames - frame - 1)
+            if skipped:
+                self.missed_deadlines = self.missed_deadlines + 1
+                self.frames_skipped = self.frames_skipped + skipped
+                lateness = lateness - skipped * period
+
+            self.neo.scroll_by(self.step * (1 + skipped))
+
+            self.frames_shown = self.frames_shown + 1
+            self.jitter_sum = self.jitter_sum + lateness
+            if lateness > self.jitter_max:
+                self.jitter_max = lateness
+            frame = frame + 1 + skipped
+            deadline = deadline + (1 + skipped) * period
+
+        self.running = False
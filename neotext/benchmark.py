@@ -0,0 +1,195 @@
+"""
+benchmark of NeoWrite under CPython, using the dummy board and neopixel modules
+measures write, scroll, clear and reset for 1 to 4 tiles and messages of 1 to 1000 characters
+and prints the results as JSON, to compare releases and backends
+
+usage: python benchmark.py [--backend neotext|numpy] [--repeat N] [--gc-every N] [--output FILE]
+author: Sebastian Heiden
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+
+import board as b
+import neotext as nt
+
+TILES = (1, 2, 3, 4)
+MESSAGE_LENGTHS = (1, 10, 100, 1000)
+SCROLL_FRAMES = 100
+TEXT = "The quick brown fox jumps over the lazy dog 0123456789. "
+
+
+def _message(length):
+    """
+    :type length: int number of characters
+    :return: str sample text of the given length
+    """
+    return (TEXT * (length // len(TEXT) + 1))[:length]
+
+
+def _make(backend, tiles, gc_every):
+    """
+    :type backend: str neotext or numpy
+    :type tiles: int number of matrices
+    :type gc_every: int garbage collector policy of NeoWrite
+    :return: NeoWrite
+    """
+    if backend == "numpy":
+        import numpy_backend
+        return numpy_backend.NumpyNeoWrite(tiles, b.D4, gc_every=gc_every)
+    return nt.NeoWrite(tiles, b.D4, gc_every=gc_every)
+
+
+def _best_time(function, repeat):
+    """
+    :param function: callable without arguments, called repeat times
+    :type repeat: int
+    :return: float shortest duration of one call in seconds
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        duration = time.perf_counter() - start
+        if best is None or duration < best:
+            best = duration
+    return best
+
+
+def bench_write(backend, tiles, length, repeat, gc_every):
+    """
+    write a message into a new NeoWrite
+    :return: dict with characters per second and peak memory in bytes
+    """
+    text = _message(length)
+
+    seconds = None
+    for _ in range(repeat):
+        neo = _make(backend, tiles, gc_every)
+        start = time.perf_counter()
+        neo.write(text)
+        duration = time.perf_counter() - start
+        if seconds is None or duration < seconds:
+            seconds = duration
+
+    tracemalloc.start()
+    _make(backend, tiles, gc_every).write(text)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"seconds": seconds, "chars_per_second": length / seconds, "peak_bytes": peak}
+
+
+def bench_scroll(backend, tiles, length, repeat, gc_every):
+    """
+    scroll a written message by SCROLL_FRAMES columns
+    :return: dict with frames per second and peak memory in bytes
+    """
+    neo = _make(backend, tiles, gc_every)
+    neo.write(_message(length))
+
+    def run():
+        for _ in range(SCROLL_FRAMES):
+            neo.scroll_by(-1)
+
+    seconds = _best_time(run, repeat)
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"seconds": seconds, "frames_per_second": SCROLL_FRAMES / seconds, "peak_bytes": peak}
+
+
+def bench_clear(backend, tiles, length, repeat, gc_every):
+    """
+    clear a written message
+    :return: dict with the latency in seconds
+    """
+    neo = _make(backend, tiles, gc_every)
+    return {"seconds": _latency(neo, _message(length), neo.clear, repeat)}
+
+
+def bench_reset(backend, tiles, length, repeat, gc_every):
+    """
+    redraw a written message with a new intensity
+    :return: dict with the latency in seconds
+    """
+    neo = _make(backend, tiles, gc_every)
+    text = _message(length)
+    return {"seconds": _latency(neo, text, lambda: neo.reset(intensity=20), repeat)}
+
+
+def _latency(neo, text, function, repeat):
+    """
+    :return: float shortest duration of function in seconds, measured after writing text
+    """
+    best = None
+    for _ in range(repeat):
+        neo.clear()
+        neo.write(text)
+        start = time.perf_counter()
+        function()
+        duration = time.perf_counter() - start
+        if best is None or duration < best:
+            best = duration
+    return best
+
+
+BENCHMARKS = (
+    ("write", bench_write),
+    ("scroll", bench_scroll),
+    ("clear", bench_clear),
+    ("reset", bench_reset),
+)
+
+
+def run_benchmarks(backend="neotext", repeat=3, gc_every=1):
+    """
+    run every benchmark for every number of tiles and message length
+    failing cases are reported with the name of the exception instead of measurements
+    :type backend: str neotext or numpy
+    :type repeat: int repetitions of each measurement, the fastest one counts
+    :type gc_every: int garbage collector policy of NeoWrite
+    :return: dict
+    """
+    results = []
+    for name, benchmark in BENCHMARKS:
+        for tiles in TILES:
+            for length in MESSAGE_LENGTHS:
+                result = {"benchmark": name, "tiles": tiles, "length": length}
+                try:
+                    result.update(benchmark(backend, tiles, length, repeat, gc_every))
+                except Exception as error:  # pylint: disable=broad-except
+                    result["error"] = type(error).__name__ + ": " + str(error)
+                results.append(result)
+
+    return {
+        "backend": backend,
+        "python": sys.version.split()[0],
+        "repeat": repeat,
+        "gc_every": gc_every,
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="benchmark NeoWrite with the dummy neopixel module")
+    parser.add_argument("--backend", choices=("neotext", "numpy"), default="neotext")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--gc-every", type=int, default=1)
+    parser.add_argument("--output", help="file for the JSON results, default stdout")
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.backend, args.repeat, args.gc_every)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
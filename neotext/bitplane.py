@@ -0,0 +1,321 @@
+"""
+NeoWrite with a bitplane canvas: every row of pixels is one int, bit x is set if column x is lit
+the colors are kept as spans of columns, so each column has one color
+scrolling only moves the viewport, the visible part of a row is cut out by one shift and one mask,
+the canvas needs 1 bit per pixel instead of 3 bytes, which suits long texts of few colors on small boards
+author: Sebastian Heiden
+"""
+
+import array
+
+import font as f
+from neotext import Color, COLORS, NeoWrite
+
+
+class BitplaneNeoWrite(NeoWrite):
+    """
+    NeoWrite keeping its content in one int bitmask per row of pixels and color spans
+    pixels written in the columns of another color take the color of the latest write in these columns
+    """
+
+    def __init__(self, num_tiles, pin, back_color=Color(COLORS.BLACK), intensity=5, orientation="ZIGZAG",
+                 gc_every=1, tile_rows=1, tile_layout=None, profile=False):
+        """
+        :type num_tiles: int number of neopixel matrices in each row of the grid
+        :type pin: pin, sequence of pins or an object with the interface of NeoPixel
+        :type back_color: Color
+        :type intensity: int
+        :type gc_every: int run the garbage collector after every gc_every shown frames, 0 never runs it
+        :type tile_rows: int number of rows of matrices in the grid
+        :type tile_layout: sequence of (tile_x, tile_y) positions of the matrices in the order of the chain
+        :type profile: bool measure the duration of the stages of each frame, see NeoWrite.stats()
+        """
+        self.rows = []
+        self.span_starts = []  # first column of each color span, a span lasts until the next one starts
+        self.span_colors = []  # palette index of each span, -1 for no color
+        self.back = (0, 0, 0)
+        self.glyph_rows = {}  # (font, glyph index) -> row bitmasks of the glyph
+        super().__init__(num_tiles, pin, back_color, intensity, orientation, cache_bytes=0, gc_every=gc_every,
+                         tile_rows=tile_rows, tile_layout=tile_layout, profile=profile)
+
+    def clear(self, in_num=0, back_color=Color(COLORS.BLACK), intensity=0):
+        """
+        clear to background color back_color with the max. intensity intensity
+        and resetting the starting in_num for next write
+        :type in_num: int number of x-position offset
+        :type back_color: Color color to set
+        :type intensity: int max. intensity of each led
+        :return: None
+        """
+        assert in_num >= 0
+        assert in_num < self.num_columns
+        assert intensity >= 0
+        assert intensity <= 100
+
+        self.offset = in_num
+        self.max_x = self.offset
+        self.view_x = 0
+        self.rows = [0] * self.num_rows
+        self.span_starts = [0]
+        self.span_colors = [-1]
+        self._clear_palette()
+        self.back = Color.intensity(back_color, intensity)
+        self._render_view()
+        self._show()
+
+    def _glyph_rows(self, font, code):
+        """
+        convert the columns of a glyph into row bitmasks, once per glyph
+        :type font: Font
+        :type code: int glyph index
+        :return: tuple of 8 int, bit x of mask y is set if column x of row y is lit
+        """
+        key = (font, code)
+        masks = self.glyph_rows.get(key)
+        if masks is None:
+            start = font.starts[code]
+            masks = [0] * 8
+            for column in range(font.widths[code]):
+                bits = font.columns[start + column]
+                for row in range(8):
+                    if bits >> row & 1:
+                        masks[row] = masks[row] | 1 << column
+            masks = tuple(masks)
+            self.glyph_rows[key] = masks
+        return masks
+
+    def _paint_span(self, x_start, x_stop, color_index):
+        """
+        give the columns x_start to x_stop - 1 the color color_index
+        :return: None
+        """
+        starts = self.span_starts
+        colors = self.span_colors
+        # color of the column x_stop, it stays as it is
+        index = 0
+        while index + 1 < len(starts) and starts[index + 1] <= x_stop:
+            index = index + 1
+        color_behind = colors[index]
+
+        first = 0
+        while first < len(starts) and starts[first] < x_start:
+            first = first + 1
+        last = first
+        while last < len(starts) and starts[last] <= x_stop:
+            last = last + 1
+        starts[first:last] = [x_start, x_stop]
+        colors[first:last] = [color_index, color_behind]
+
+    def write(self, text, color=Color(COLORS.WHITE), intensity=5, font=f.DEFAULT_FONT, line=0):
+        """
+        Writes the given text to the Neopixel Matrix with:
+        :type text: string text to be written
+        :type color: Color color of the LEDs
+        :type intensity: int max. intensity for each LED
+        :type font: Font bitmap font of the text
+        :type line: int row of matrices to write into, 0 is the top row
+        :return: None
+        """
+        assert intensity >= 0
+        assert intensity <= 100
+        assert 0 <= line < self.num_rows // 8
+
+        masks = [0] * 8
+        x_offset = 0
+        last_x = -1
+        for letter in text:
+            code = font.index(letter)
+            if code < 0:
+                continue
+            glyph = self._glyph_rows(font, code)
+            for row in range(8):
+                masks[row] = masks[row] | glyph[row] << x_offset
+            if font.widths[code]:
+                last_x = x_offset + font.widths[code] - 1
+            x_offset = x_offset + font.advances[code]
+
+        if last_x >= 0:
+            for row in range(8):
+                self.rows[line * 8 + row] = self.rows[line * 8 + row] | masks[row] << self.offset
+            self._paint_span(self.offset, self.offset + last_x + 1, self._palette_index(color, intensity))
+            self.max_x = max(self.max_x, self.offset + last_x + 2)
+
+        self.offset = self.offset + x_offset
+        self._render_view()
+        self._show()
+
+    def write_raw(self, raw_position_list, next_offset, color=Color(COLORS.WHITE), intensity=5):
+        """
+        Write the raw (x,y)-Positions
+        :type raw_position_list: array (of Byte)
+        :type next_offset: int, offset for placement of next letter
+        :type color: Color color of the LEDs
+        :type intensity: int max. intensity of each LED
+        :return: None
+        """
+        assert intensity >= 0
+        assert intensity <= 100
+
+        if len(raw_position_list):
+            x_coords = raw_position_list[0::2]
+            for index in range(0, len(raw_position_list), 2):
+                y_pos = raw_position_list[index + 1]
+                self.rows[y_pos] = self.rows[y_pos] | 1 << (raw_position_list[index] + self.offset)
+            x_start = min(x_coords) + self.offset
+            x_stop = max(x_coords) + self.offset + 1
+            self._paint_span(x_start, x_stop, self._palette_index(color, intensity))
+            self.max_x = max(self.max_x, x_stop + 1)
+
+        self.offset = next_offset
+        self._render_view()
+        self._show()
+
+    def erase(self, x_start, x_stop, y_start=0, y_stop=None):
+        """
+        remove the written pixels of a region and show the result
+        :param x_start: int first canvas column
+        :param x_stop: int canvas column behind the last one
+        :param y_start: int first row
+        :param y_stop: int row behind the last one, defaults to the number of rows
+        :return: None
+        """
+        if y_stop is None:
+            y_stop = self.num_rows
+        assert 0 <= x_start <= x_stop
+        assert 0 <= y_start <= y_stop <= self.num_rows
+
+        keep = ~((1 << (x_stop - x_start)) - 1 << x_start)
+        for y_pos in range(y_start, y_stop):
+            self.rows[y_pos] = self.rows[y_pos] & keep
+        self._render_view()
+        self._show()
+
+    def reset(self, in_num=0, back_color=Color(COLORS.BLACK), foreground_color=Color(COLORS.WHITE), intensity=5):
+        """
+        dim everything written to intensity with back_color as background, see NeoWrite.reset
+        :return: None
+        """
+        assert in_num >= 0
+        assert in_num < self.num_columns
+        assert intensity >= 0
+        assert intensity <= 100
+
+        self.offset = in_num
+        self._dim_palette(intensity)
+        self.back = Color.intensity(back_color, intensity)
+        self._render_view()
+        self._show()
+
+    def stored_pixels(self, x_start, x_stop):
+        """
+        the written pixels of a range of columns in the color of their span, see NeoWrite.stored_pixels
+        :param x_start: int first column
+        :param x_stop: int column behind the last one
+        :return: array (x, y << 8 | palette index) of the pixels, sorted by column
+        """
+        records = array.array("H")
+        span = 0
+        for x_pos in range(max(x_start, 0), x_stop):
+            while span + 1 < len(self.span_starts) and self.span_starts[span + 1] <= x_pos:
+                span = span + 1
+            for y_pos in range(self.num_rows):
+                if self.rows[y_pos] >> x_pos & 1:
+                    records.append(x_pos)
+                    records.append(y_pos << 8 | self.span_colors[span])
+        return records
+
+    def _remap_palette(self, index, other):
+        self.span_colors = [other if color == index else color for color in self.span_colors]
+
+    def _repaint(self, index=None):
+        # there is no canvas of colors, the palette is read while rendering
+        return
+
+    def _render_view(self):
+        """
+        cut the visible window out of every row, starting with column view_x, and put its lit pixels
+        in the color of their span into the neopixel buffer
+        :return: None
+        """
+        num_columns = self.num_columns
+        num_rows = self.num_rows
+        width = max(self.max_x, num_columns)
+        view_x = self.view_x
+        window = (1 << num_columns) - 1
+
+        # wire bytes of the color of each visible column
+        bpp = self.neopixels.bpp
+        order = self.neopixels.order
+        pixels = {}
+        column_pixel = [None] * num_columns
+        span = 0
+        for x_pos in range(num_columns):
+            src_x = (view_x + x_pos) % width
+            if src_x < self.span_starts[span]:
+                span = 0
+            while span + 1 < len(self.span_starts) and self.span_starts[span + 1] <= src_x:
+                span = span + 1
+            color = self.span_colors[span]
+            pixel = pixels.get(color)
+            if pixel is None:
+                pixel = bytearray(bpp)
+                if color >= 0:
+                    for channel in range(3):
+                        pixel[order[channel]] = self.palette[color * 3 + channel]
+                pixels[color] = pixel
+            column_pixel[x_pos] = pixel
+
+        self.neopixels.fill(self.back)
+        buf = self.neopixels.buf
+        for y_pos in range(num_rows):
+            row = self.rows[y_pos]
+            if view_x + num_columns <= width:
+                visible = row >> view_x & window
+            else:
+                # the window wraps around behind the end of the content
+                visible = (row >> view_x | row << (width - view_x)) & window
+            while visible:
+                lowest = visible & -visible
+                x_pos = lowest.bit_length() - 1
+                visible = visible ^ lowest
+                pos = self.led_map[x_pos * num_rows + y_pos] * bpp
+                buf[pos:pos + bpp] = column_pixel[x_pos]
+        self.mark_dirty()
+
+
+def run_checks():
+    """
+    behavior checks: BitplaneNeoWrite shows the same frames and stores the same pixels as NeoWrite
+    for texts of one color per column
+    :return: None
+    """
+    heart = array.array("B", (0, 3, 0, 4, 1, 2, 1, 3, 1, 4, 1, 5, 2, 3, 2, 4, 6, 4))
+    steps = (
+        lambda neo: neo.write("Hello 42", color=Color(COLORS.ORANGE), intensity=30),
+        lambda neo: neo.write_raw(heart, neo.offset + 8, Color(COLORS.RED)),
+        lambda neo: neo.scroll_by(-5),
+        lambda neo: neo.write("xyz", color=Color(COLORS.BLUE)),
+        lambda neo: neo.scroll_by(3),
+        lambda neo: neo.recolor(Color(COLORS.RED), Color(COLORS.GREEN)),
+        lambda neo: neo.erase(2, 9, 0, 5),
+        lambda neo: neo.reset(back_color=Color(COLORS.CYAN), intensity=10),
+        lambda neo: neo.scroll_by(-20),
+    )
+    for orientation in ("ZIGZAG", "LINE"):
+        expected = NeoWrite(2, 0, orientation=orientation)
+        bitplane = BitplaneNeoWrite(2, 0, orientation=orientation)
+        for index, step in enumerate(steps):
+            step(expected)
+            step(bitplane)
+            assert bitplane.neopixels.buf == expected.neopixels.buf, (orientation, index)
+            stored = []
+            for neo in (expected, bitplane):
+                records = neo.stored_pixels(0, neo.max_x)
+                stored.append(set(zip(records[0::2], records[1::2])))
+            assert stored[0] == stored[1], (orientation, index)
+    print("Bitplane checks passed!")
+
+
+if __name__ == "__main__":
+
+    run_checks()
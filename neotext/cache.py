@@ -0,0 +1,78 @@
+"""
+least recently used cache with a budget in bytes, used by neotext to keep rendered texts
+author: Sebastian Heiden
+"""
+
+
+class LRUCache:
+    """
+    maps keys to values, the least recently used values are dropped as soon as the
+    stored values need more than max_bytes
+    """
+
+    def __init__(self, max_bytes):
+        """
+        :type max_bytes: int budget of all stored values in bytes, 0 disables the cache
+        """
+        assert max_bytes >= 0
+
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = {}
+        self._order = []  # least recently used key first
+
+    def get(self, key):
+        """
+        get the value stored for key and mark it as most recently used
+        :param key: hashable key
+        :return: stored value or None
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses = self.misses + 1
+            return None
+
+        self.hits = self.hits + 1
+        if self._order[-1] != key:
+            self._order.remove(key)
+            self._order.append(key)
+        return entry[0]
+
+    def put(self, key, value, num_bytes):
+        """
+        store value for key, evict least recently used values until it fits into max_bytes
+        values larger than max_bytes are not stored
+        :param key: hashable key
+        :param value: value to store
+        :type num_bytes: int size of value in bytes
+        :return: None
+        """
+        if num_bytes > self.max_bytes:
+            return
+        if key in self._entries:
+            self.size = self.size - self._entries[key][1]
+            self._order.remove(key)
+
+        while self.size + num_bytes > self.max_bytes:
+            oldest = self._order.pop(0)
+            self.size = self.size - self._entries.pop(oldest)[1]
+            self.evictions = self.evictions + 1
+
+        self._entries[key] = (value, num_bytes)
+        self._order.append(key)
+        self.size = self.size + num_bytes
+
+    def clear(self):
+        """
+        drop all stored values, the counters are kept
+        :return: None
+        """
+        self._entries = {}
+        self._order = []
+        self.size = 0
+
+    def __len__(self):
+        return len(self._entries)
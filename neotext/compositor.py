@@ -0,0 +1,295 @@
+"""
+layers for NeoWrite: the frame shown is composed of ordered layers, e.g. a background, a scrolling text,
+sprites and an overlay, each with its own offset and transparent color
+only layers, which changed since the last frame, are composed again: the layers below the lowest changed layer
+are kept as one composed frame, so a static background is not painted again for every step of a text above it
+author: Sebastian Heiden
+"""
+
+import neopixel
+from neotext import NeoWrite
+
+
+class Layer:
+    """
+    frame of the size of the display in the pixel order of its neopixels, pixels of the transparent color key
+    show the layers below
+    """
+
+    def __init__(self, compositor, key=(0, 0, 0)):
+        """
+        :type compositor: Compositor the layer belongs to
+        :type key: tuple (red, green, blue) transparent color
+        """
+        self.compositor = compositor
+        output = compositor.neo.neopixels
+        self.bpp = output.bpp
+        self.order = output.order
+        self.frame = bytearray(len(output.buf))
+        self.key = self._pixel(key)
+        self.offset_x = 0
+        self.offset_y = 0
+        self.visible = True
+        self.dirty = True
+
+    def _pixel(self, color):
+        """
+        :type color: tuple (red, green, blue)
+        :return: bytearray the color in wire order
+        """
+        pixel = bytearray(self.bpp)
+        for channel in range(3):
+            pixel[self.order[channel]] = color[channel]
+        return pixel
+
+    def changed(self):
+        """
+        mark the layer to be composed again, shows the frame if the compositor does so automatically
+        :return: None
+        """
+        self.dirty = True
+        if self.compositor.auto_show:
+            self.compositor.show()
+
+    def fill(self, color):
+        """
+        :type color: tuple (red, green, blue)
+        :return: None
+        """
+        self.frame[:] = self._pixel(color) * (len(self.frame) // self.bpp)
+        self.changed()
+
+    def pattern(self, function):
+        """
+        paint every pixel of the layer with the color function(x, y) returns
+        :param function: callable with int x and y, returning a tuple (red, green, blue)
+        :return: None
+        """
+        neo = self.compositor.neo
+        for x_pos in range(neo.num_columns):
+            for y_pos in range(neo.num_rows):
+                pos = neo.led_map[x_pos * neo.num_rows + y_pos] * self.bpp
+                self.frame[pos:pos + self.bpp] = self._pixel(function(x_pos, y_pos))
+        self.changed()
+
+    def set_pixel(self, x_pos, y_pos, color):
+        """
+        :type x_pos: int column
+        :type y_pos: int row
+        :type color: tuple (red, green, blue), the key makes the pixel transparent again
+        :return: None
+        """
+        neo = self.compositor.neo
+        pos = neo.led_map[x_pos * neo.num_rows + y_pos] * self.bpp
+        self.frame[pos:pos + self.bpp] = self._pixel(color)
+        self.changed()
+
+    def move(self, offset_x, offset_y=0):
+        """
+        show the layer shifted by offset_x columns to the right and offset_y rows down
+        :type offset_x: int
+        :type offset_y: int
+        :return: None
+        """
+        self.offset_x = offset_x
+        self.offset_y = offset_y
+        self.changed()
+
+    def set_visible(self, visible):
+        """
+        :type visible: bool
+        :return: None
+        """
+        self.visible = visible
+        self.changed()
+
+
+class _LayerPixels(neopixel.NeoPixel):
+    """
+    neopixels of the NeoWrite of a TextLayer, their transmitted frames go into the layer
+    """
+
+    def __init__(self, layer, n):
+        pixel_order = layer.order if len(layer.order) == layer.bpp else None
+        self.layer = layer
+        super().__init__(None, n, bpp=layer.bpp, auto_write=False, pixel_order=pixel_order)
+
+    def _transmit(self, wire, start):
+        self.layer.frame[start:len(wire)] = wire[start:]
+        self.layer.changed()
+
+
+class TextLayer(Layer):
+    """
+    layer with its own NeoWrite neo, everything neo writes, scrolls or draws by write_raw is shown in the layer
+    """
+
+    def __init__(self, compositor, key=(0, 0, 0), cache_bytes=2048):
+        """
+        :type compositor: Compositor the layer belongs to
+        :type key: tuple (red, green, blue) transparent color
+        :type cache_bytes: int RAM budget of the render cache of neo
+        """
+        super().__init__(compositor, key)
+        output = compositor.neo
+        num_tiles = output.num_columns // 8
+        tile_layout = [None] * len(output.tile_chain)
+        for index, chain_pos in enumerate(output.tile_chain):
+            tile_layout[chain_pos] = (index % num_tiles, index // num_tiles)
+        # the garbage collector runs, when the compositor shows a frame
+        self.neo = NeoWrite(num_tiles, _LayerPixels(self, output.num_pixels), orientation=output.orientation,
+                            cache_bytes=cache_bytes, gc_every=0, tile_rows=output.num_rows // 8,
+                            tile_layout=tile_layout)
+
+
+class Compositor:
+    """
+    composes the layers in the order they were added, the first one at the bottom, into the neopixels of a NeoWrite
+    """
+
+    def __init__(self, neo, auto_show=True):
+        """
+        :type neo: NeoWrite whose neopixels show the composed frames
+        :type auto_show: bool show a new frame after every change of a layer, else show() has to be called
+        """
+        self.neo = neo
+        self.auto_show = auto_show
+        self.layers = []
+        # composed frame of the layers below layers[below]
+        self.below = -1
+        self.below_frame = bytearray(len(neo.neopixels.buf))
+        self.frames_composed = 0
+        self.layers_composed = 0
+
+    def add_layer(self, key=(0, 0, 0)):
+        """
+        add a layer on top of the others, e.g. a background for fill() or pattern()
+        :type key: tuple (red, green, blue) transparent color
+        :return: Layer
+        """
+        layer = Layer(self, key)
+        self.layers.append(layer)
+        return layer
+
+    def add_text_layer(self, key=(0, 0, 0), cache_bytes=2048):
+        """
+        add a layer with its own NeoWrite on top of the others, written by layer.neo
+        :type key: tuple (red, green, blue) transparent color
+        :type cache_bytes: int RAM budget of the render cache of the NeoWrite
+        :return: TextLayer
+        """
+        auto_show = self.auto_show
+        self.auto_show = False
+        layer = TextLayer(self, key, cache_bytes)
+        self.auto_show = auto_show
+        self.layers.append(layer)
+        return layer
+
+    def _overlay(self, frame, layer):
+        """
+        put the pixels of layer, which are not transparent, onto frame
+        :type frame: bytearray in the pixel order of the neopixels
+        :type layer: Layer
+        :return: None
+        """
+        source = layer.frame
+        key = layer.key
+        bpp = layer.bpp
+        self.layers_composed = self.layers_composed + 1
+        if not layer.offset_x and not layer.offset_y:
+            for pos in range(0, len(source), bpp):
+                pixel = source[pos:pos + bpp]
+                if pixel != key:
+                    frame[pos:pos + bpp] = pixel
+            return
+
+        neo = self.neo
+        num_rows = neo.num_rows
+        led_map = neo.led_map
+        for x_pos in range(max(layer.offset_x, 0), min(neo.num_columns, neo.num_columns + layer.offset_x)):
+            for y_pos in range(max(layer.offset_y, 0), min(num_rows, num_rows + layer.offset_y)):
+                src = led_map[(x_pos - layer.offset_x) * num_rows + y_pos - layer.offset_y] * bpp
+                pixel = source[src:src + bpp]
+                if pixel != key:
+                    pos = led_map[x_pos * num_rows + y_pos] * bpp
+                    frame[pos:pos + bpp] = pixel
+
+    def show(self):
+        """
+        compose the changed layers and the ones above them and show the frame
+        :return: None
+        """
+        lowest = -1
+        for index, layer in enumerate(self.layers):
+            if layer.dirty:
+                lowest = index
+                break
+        if lowest < 0:
+            return
+
+        if self.below != lowest:
+            # the layers below the lowest changed one did not change, they are composed once
+            self.below_frame[:] = bytes(len(self.below_frame))
+            for layer in self.layers[:lowest]:
+                if layer.visible:
+                    self._overlay(self.below_frame, layer)
+            self.below = lowest
+
+        buf = self.neo.neopixels.buf
+        buf[:] = self.below_frame
+        for layer in self.layers[lowest:]:
+            if layer.visible:
+                self._overlay(buf, layer)
+            layer.dirty = False
+        self.frames_composed = self.frames_composed + 1
+        self.neo.mark_dirty()
+        self.neo._show()
+
+
+def run_checks():
+    """
+    behavior checks: a text layer is shown over a background layer, the background is composed only once
+    :return: None
+    """
+    from neotext import Color, COLORS
+
+    neo = NeoWrite(1, 0)
+    compositor = Compositor(neo)
+    background = compositor.add_layer()
+    text = compositor.add_text_layer()
+    background.fill((0, 0, 9))
+    back_pixel = background._pixel((0, 0, 9))
+    transparent = bytes(background.bpp)
+    bpp = background.bpp
+
+    expected = NeoWrite(1, 0)
+    steps = (
+        lambda write: write.write("Hi", Color(COLORS.RED), 50),
+        lambda write: write.scroll_by(-1),
+        lambda write: write.scroll_by(-1),
+        lambda write: write.scroll_by(-3),
+    )
+    for index, step in enumerate(steps):
+        if index == 1:
+            frames = compositor.frames_composed
+            layers = compositor.layers_composed
+        step(text.neo)
+        step(expected)
+        front = expected.neopixels._front
+        for pos in range(0, len(front), bpp):
+            pixel = front[pos:pos + bpp]
+            if pixel == transparent:
+                pixel = back_pixel
+            assert neo.neopixels._front[pos:pos + bpp] == pixel, pos
+    # only the text layer changed, the background is kept as a composed frame
+    assert compositor.frames_composed - frames == len(steps) - 1
+    assert compositor.layers_composed - layers == len(steps) - 1
+
+    text.set_visible(False)
+    assert neo.neopixels._front == back_pixel * (len(front) // bpp)
+    print("Compositor checks passed!")
+
+
+if __name__ == "__main__":
+
+    run_checks()
@@ -0,0 +1,198 @@
+"""
+output of NeoWrite over the network: a NeoPixel, which sends its frames by UDP in the
+Distributed Display Protocol (DDP) to an LED controller, e.g. WLED, instead of driving a pin
+the fonts are rendered on the host, the controller only shows the pixels
+
+    neo = NeoWrite(4, ddp.DDPPixels(("192.168.1.50", ddp.PORT), 256))
+author: Sebastian Heiden
+"""
+
+import socket
+import struct
+import time
+
+import neopixel
+
+PORT = 4048
+# header: flags, sequence number, data type, destination id, data offset, data length
+HEADER = struct.Struct(">BBBBIH")
+MAX_DATA = 1440  # bytes per packet, whole pixels for RGB and RGBW
+FLAG_VERSION_1 = 0x40
+FLAG_PUSH = 0x01  # the controller shows the frame after the packet with this flag
+TYPE_RGB = 0x0B  # 8 bit red, green, blue
+TYPE_RGBW = 0x1B  # 8 bit red, green, blue, white
+DESTINATION_DISPLAY = 1
+
+
+class DDPPixels(neopixel.NeoPixel):
+    """
+    NeoPixel chain of n pixels behind a DDP controller at address
+    a frame is sent as packets of up to MAX_DATA bytes, the last one pushes the frame onto the LEDs
+    only the bytes from the first to the last changed pixel are sent, every keyframe_every calls of show()
+    the whole chain is sent again, changed or not, which repairs the LEDs after lost packets
+    show() sends at most max_fps frames per second, a frame shown too early waits until its time has come,
+    so the last frame of a static sign is never lost, but show() may block up to 1 / max_fps seconds
+    """
+
+    def __init__(self, address, n, *, bpp=3, brightness=1.0, auto_write=True, pixel_order=None, max_fps=60.0,
+                 keyframe_every=50):
+        """
+        :type address: tuple (host, port) of the controller
+        :type n: int number of pixels
+        :type pixel_order: tuple, defaults to RGB (RGBW for bpp 4), the channel order of DDP
+        :type max_fps: float max. frames per second, 0 does not limit the rate
+        :type keyframe_every: int send the whole chain with every keyframe_every-th show(), 0 never
+        """
+        assert max_fps >= 0.0
+        assert keyframe_every >= 0
+        if pixel_order is None:
+            pixel_order = neopixel.RGBW if bpp == 4 else neopixel.RGB
+
+        self.address = address
+        self.min_interval = 1.0 / max_fps if max_fps else 0.0
+        self.keyframe_every = keyframe_every
+        self.next_send = 0.0
+        self.frames_limited = 0  # frames, which waited for the rate limit
+        self.shows = 0
+        self.packets_sent = 0
+        self.sequence = 0
+        self.data_type = TYPE_RGBW if len(pixel_order) == 4 else TYPE_RGB
+        self.packet = bytearray(HEADER.size + MAX_DATA)
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        super().__init__(None, n, bpp=bpp, brightness=brightness, auto_write=auto_write, pixel_order=pixel_order)
+
+    def show(self):
+        """Sends the changed pixels to the controller. If the last frame has been sent less than
+        1 / max_fps seconds ago, it waits until then first."""
+        self.shows += 1
+        if self.keyframe_every and not (self.shows - 1) % self.keyframe_every:
+            # the whole buffer is transmitted again, even if nothing changed
+            self._retransmit = True
+            self.mark_dirty()
+        if self.dirty and self.min_interval:
+            delay = self.next_send - time.monotonic()
+            if delay > 0:
+                self.frames_limited += 1
+                time.sleep(delay)
+        super().show()
+
+    def _transmit(self, wire, start):
+        # whole pixels from the first changed one on
+        start = start - start % self.bpp
+        packet = memoryview(self.packet)
+        self.sequence = self.sequence % 15 + 1  # 1 to 15, 0 means unused
+
+        while True:
+            length = min(len(wire) - start, MAX_DATA)
+            last = start + length >= len(wire)
+            HEADER.pack_into(packet, 0, FLAG_VERSION_1 | (FLAG_PUSH if last else 0), self.sequence,
+                             self.data_type, DESTINATION_DISPLAY, start, length)
+            packet[HEADER.size:HEADER.size + length] = wire[start:start + length]
+            self.socket.sendto(packet[:HEADER.size + length], self.address)
+            self.packets_sent += 1
+            start = start + length
+            if last:
+                break
+
+        packet.release()
+        self.next_send = time.monotonic() + self.min_interval
+        super()._transmit(wire, 0)
+
+    def deinit(self):
+        """Blank out the NeoPixels and close the socket."""
+        super().deinit()
+        self.next_send = 0.0
+        self.show()
+        self.socket.close()
+
+
+class DDPReceiver:
+    """
+    minimal DDP controller on a local UDP port, stands in for the LEDs in tests
+    """
+
+    def __init__(self, port=PORT, host="127.0.0.1", size=0x10000):
+        """
+        :type port: int UDP port to listen on, 0 chooses a free one, see address
+        :type host: str address to listen on
+        :type size: int max. number of bytes of the chain
+        """
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind((host, port))
+        self.address = self.socket.getsockname()
+        self.leds = bytearray(size)
+        self.length = 0  # bytes of the chain received so far
+        self.frames = 0
+        self.packets = 0
+
+    def receive(self, timeout=1.0):
+        """
+        read packets into leds until a packet pushes the frame
+        :type timeout: float seconds to wait for each packet
+        :return: bytes the received chain, None after a timeout
+        """
+        self.socket.settimeout(timeout)
+        while True:
+            try:
+                packet = self.socket.recv(HEADER.size + MAX_DATA)
+            except socket.timeout:
+                return None
+            flags, _, _, _, offset, length = HEADER.unpack_from(packet, 0)
+            self.leds[offset:offset + length] = packet[HEADER.size:HEADER.size + length]
+            self.length = max(self.length, offset + length)
+            self.packets += 1
+            if flags & FLAG_PUSH:
+                self.frames += 1
+                return bytes(self.leds[:self.length])
+
+    def close(self):
+        self.socket.close()
+
+
+def run_checks():
+    """
+    behavior checks: DDP loopback of the frames of a NeoWrite
+    :return: None
+    """
+    import neotext as nt
+
+    # DDP frames arrive complete, keyframes repair a static sign
+    receiver = DDPReceiver(0)
+    output = DDPPixels(receiver.address, 64, auto_write=False, max_fps=0, keyframe_every=2)
+    neo = nt.NeoWrite(1, output)
+    assert receiver.receive() == bytes(output._front)
+    neo.write("A")
+    assert receiver.receive() == bytes(output._front)
+    packets = receiver.packets
+    output.show()
+    assert receiver.receive() == bytes(output._front)
+    assert receiver.packets > packets
+    output.show()
+    assert receiver.receive(timeout=0.2) is None
+    neo.deinit()
+    receiver.close()
+
+    # with the default rate limit the last of several quick frames arrives as well
+    receiver = DDPReceiver(0)
+    output = DDPPixels(receiver.address, 64, auto_write=False)
+    neo = nt.NeoWrite(1, output)
+    neo.write("A")
+    neo.clear()
+    neo.write("B")
+    assert not output.dirty
+    received = None
+    while True:
+        frame = receiver.receive(timeout=0.2)
+        if frame is None:
+            break
+        received = frame
+    assert received == bytes(output._front)
+    assert output.frames_limited > 0
+    neo.deinit()
+    receiver.close()
+    print("DDP checks passed!")
+
+
+if __name__ == "__main__":
+
+    run_checks()
@@ -0,0 +1,164 @@
+"""
+headless emulator of the LEDs of a NeoWrite under CPython
+receives the frames the dummy neopixel module transmits, decodes them with the pixel order, bpp and brightness of
+the chain and maps the LEDs back to (x, y) through the tile layout of the NeoWrite
+the frames can be saved as PPM images, printed as ANSI truecolor text or kept in memory
+
+usage: python emulator.py [text] [--tiles N] [--frames N] [--fps FPS]
+author: Sebastian Heiden
+"""
+
+import argparse
+import collections
+import time
+
+import array as a
+import board as b
+import neotext as nt
+
+
+class Emulator:
+    """
+    LEDs of a NeoWrite, which show the frames of its neopixels
+    every frame updates the LEDs up to the end of the transmitted data, the LEDs behind keep their colors
+    """
+
+    def __init__(self, neo, keep_frames=0, terminal=False):
+        """
+        :type neo: NeoWrite to emulate, its neopixels send their frames to this emulator from now on
+        :type keep_frames: int number of the latest frames to keep in frames, 0 keeps none
+        :type terminal: bool print every frame as ANSI truecolor text
+        """
+        assert keep_frames >= 0
+
+        neopixels = neo.neopixels
+        self.width = neo.num_columns
+        self.height = neo.num_rows
+        self.order = neopixels.order
+        self.bpp = neopixels.bpp
+        self.terminal = terminal
+        # wire bytes of the chain, as the LEDs show them (brightness applied)
+        self.leds = bytearray(len(neopixels.buf))
+        # byte position in leds of the pixels, row by row from the upper left pixel
+        self.positions = a.array("L", (0 for _ in range(self.width * self.height)))
+        for x_pos in range(self.width):
+            for y_pos in range(self.height):
+                self.positions[y_pos * self.width + x_pos] = neo.led_map[x_pos * self.height + y_pos] * self.bpp
+        self.frames = collections.deque(maxlen=keep_frames) if keep_frames else None
+        self.reset_stats()
+        neopixels.emulator = self
+
+    def reset_stats(self):
+        """
+        set the throughput counters to 0
+        :return: None
+        """
+        self.frames_received = 0
+        self.bytes_received = 0
+        self.start_time = time.perf_counter()
+
+    def stats(self):
+        """
+        throughput since the last reset_stats()
+        :return: dict with frames, bytes, seconds and frames per second
+        """
+        seconds = time.perf_counter() - self.start_time
+        return {
+            "frames": self.frames_received,
+            "bytes": self.bytes_received,
+            "seconds": seconds,
+            "frames_per_second": self.frames_received / seconds if seconds > 0 else 0.0,
+        }
+
+    def receive(self, wire):
+        """
+        called by the neopixels for every transmitted frame
+        :type wire: bytes-like data transmitted from the first LED on
+        :return: None
+        """
+        self.leds[:len(wire)] = wire
+        self.frames_received = self.frames_received + 1
+        self.bytes_received = self.bytes_received + len(wire)
+        if self.frames is not None:
+            self.frames.append(bytes(self.leds))
+        if self.terminal:
+            # cursor to the upper left corner, the next frame overwrites this one
+            print("\x1b[H" + self.ansi(), end="", flush=True)
+
+    def image(self, frame=None):
+        """
+        decode a frame into RGB pixels, a white channel is added to the colors
+        :type frame: bytes-like element of frames or None for the current LEDs
+        :return: bytearray red, green, blue of each pixel, row by row from the upper left pixel
+        """
+        leds = self.leds if frame is None else frame
+        red, green, blue = self.order[0], self.order[1], self.order[2]
+        white = self.order[3] if self.bpp == 4 else -1
+        pixels = bytearray(3 * len(self.positions))
+        for index, pos in enumerate(self.positions):
+            if white < 0:
+                pixels[index * 3] = leds[pos + red]
+                pixels[index * 3 + 1] = leds[pos + green]
+                pixels[index * 3 + 2] = leds[pos + blue]
+            else:
+                pixels[index * 3] = min(leds[pos + red] + leds[pos + white], 0xFF)
+                pixels[index * 3 + 1] = min(leds[pos + green] + leds[pos + white], 0xFF)
+                pixels[index * 3 + 2] = min(leds[pos + blue] + leds[pos + white], 0xFF)
+        return pixels
+
+    def save_ppm(self, path, frame=None, scale=1):
+        """
+        save a frame as binary PPM image
+        :type path: str file to write
+        :type frame: bytes-like element of frames or None for the current LEDs
+        :type scale: int width and height of each LED in image pixels
+        :return: None
+        """
+        assert scale > 0
+
+        pixels = self.image(frame)
+        with open(path, "wb") as output:
+            output.write(b"P6 %d %d 255\n" % (self.width * scale, self.height * scale))
+            for y_pos in range(self.height):
+                row = bytearray()
+                for x_pos in range(self.width):
+                    pos = (y_pos * self.width + x_pos) * 3
+                    row.extend(pixels[pos:pos + 3] * scale)
+                output.write(bytes(row) * scale)
+
+    def ansi(self, frame=None):
+        """
+        :type frame: bytes-like element of frames or None for the current LEDs
+        :return: str frame as ANSI truecolor text, two characters per LED
+        """
+        pixels = self.image(frame)
+        lines = []
+        for y_pos in range(self.height):
+            line = []
+            for x_pos in range(self.width):
+                pos = (y_pos * self.width + x_pos) * 3
+                line.append("\x1b[48;2;%d;%d;%dm  " % (pixels[pos], pixels[pos + 1], pixels[pos + 2]))
+            lines.append("".join(line) + "\x1b[0m\n")
+        return "".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="scroll a text on emulated neopixel matrices in the terminal")
+    parser.add_argument("text", nargs="?", default="Hello NeoText!")
+    parser.add_argument("--tiles", type=int, default=4)
+    parser.add_argument("--frames", type=int, default=100)
+    parser.add_argument("--fps", type=float, default=20.0)
+    args = parser.parse_args()
+
+    neo = nt.NeoWrite(args.tiles, b.D4)
+    print("\x1b[2J", end="")
+    emulator = Emulator(neo, terminal=True)
+    neo.write(args.text, intensity=50)
+    for _ in range(args.frames):
+        time.sleep(1.0 / args.fps)
+        neo.scroll_by(-1)
+    print(emulator.stats())
+
+
+if __name__ == "__main__":
+    main()
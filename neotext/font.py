@@ -0,0 +1,219 @@
+"""
+packed bitmap fonts for neotext
+every glyph column is stored as one byte: bit y is set, if the pixel in row y (0 = top row) is lit
+author: Sebastian Heiden
+"""
+
+import array as a
+
+
+class Font:
+    """
+    bitmap font of up to 8 rows
+    all glyph columns lie in one contiguous bytes object, a glyph is found by its start index in it,
+    its number of columns and its advance (x-offset of the next glyph)
+    """
+
+    def __init__(self, columns, starts, widths, advances, first_char=32):
+        """
+        :type columns: bytes column bitmasks of all glyphs
+        :type starts: array (of unsigned short) index of the first column of each glyph in columns
+        :type widths: bytes number of columns of each glyph
+        :type advances: bytes x-offset of the following glyph
+        :type first_char: int character code of the first glyph
+        """
+        assert len(starts) == len(widths)
+        assert len(starts) == len(advances)
+        assert first_char >= 0
+
+        self.columns = columns
+        self.starts = starts
+        self.widths = widths
+        self.advances = advances
+        self.first_char = first_char
+
+    def index(self, character):
+        """
+        get the glyph index of the given character
+        :type character: string with one character
+        :return: int index into starts, widths and advances, -1 if the font has no glyph for it
+        """
+        code = ord(character) - self.first_char
+        if 0 <= code < len(self.widths):
+            return code
+        return -1
+
+    def glyph(self, character):
+        """
+        get the columns of the given character
+        :type character: string with one character
+        :return: int start index in columns, int number of columns, int advance
+        """
+        code = self.index(character)
+        if code < 0:
+            return 0, 0, 0
+        return self.starts[code], self.widths[code], self.advances[code]
+
+
+def load_bdf(path, spacing=0):
+    """
+    build a Font from a BDF bitmap font file, the file is read line by line to save RAM
+    :type path: str path of the .bdf file
+    :type spacing: int empty columns added to a glyph's advance, DWIDTH includes the gap between glyphs already
+    :return: Font
+    """
+    glyphs = {}
+    cell_top = 8
+    encoding = -1
+    advance = 0
+    box_width = box_height = box_x = box_y = 0
+    bitmap = None
+
+    with open(path, "r") as bdf_file:
+        for line in bdf_file:
+            words = line.split()
+            if not words:
+                continue
+            keyword = words[0]
+            if bitmap is not None:
+                if keyword == "ENDCHAR":
+                    if encoding >= 0:
+                        glyphs[encoding] = _bdf_columns(bitmap, box_width, box_x, cell_top - box_y - box_height), \
+                            advance + spacing
+                    bitmap = None
+                else:
+                    bitmap.append(words[0])
+            elif keyword == "FONTBOUNDINGBOX":
+                assert int(words[2]) <= 8, "only fonts up to 8 rows fit onto the matrices"
+                # top row of the display relative to the baseline
+                cell_top = int(words[2]) + int(words[4])
+            elif keyword == "STARTCHAR":
+                encoding = -1
+                advance = 0
+            elif keyword == "ENCODING":
+                encoding = int(words[1])
+            elif keyword == "DWIDTH":
+                advance = int(words[1])
+            elif keyword == "BBX":
+                box_width, box_height, box_x, box_y = (int(word) for word in words[1:5])
+            elif keyword == "BITMAP":
+                bitmap = []
+
+    if not glyphs:
+        return Font(b"", a.array("H", ()), b"", b"")
+
+    first_char = min(glyphs)
+    num_glyphs = max(glyphs) - first_char + 1
+    columns = bytearray()
+    starts = a.array("H", (0 for _ in range(num_glyphs)))
+    widths = bytearray(num_glyphs)
+    advances = bytearray(num_glyphs)
+    for code, (glyph_columns, glyph_advance) in glyphs.items():
+        starts[code - first_char] = len(columns)
+        widths[code - first_char] = len(glyph_columns)
+        advances[code - first_char] = glyph_advance
+        columns.extend(glyph_columns)
+    return Font(bytes(columns), starts, bytes(widths), bytes(advances), first_char)
+
+
+def _bdf_columns(bitmap, box_width, box_x, top_row):
+    """
+    convert the hex rows of a BDF glyph into column bitmasks
+    :type bitmap: list of hex strings, one per row of the bounding box
+    :type box_width: int width of the bounding box
+    :type box_x: int x-offset of the bounding box
+    :type top_row: int display row of the first bitmap row
+    :return: bytearray column bitmasks
+    """
+    left = max(box_x, 0)
+    glyph_columns = bytearray(left + box_width)
+    for row_index, hex_row in enumerate(bitmap):
+        y_pos = top_row + row_index
+        if y_pos < 0 or y_pos > 7:
+            continue
+        row = int(hex_row, 16)
+        num_bits = len(hex_row) * 4
+        for column in range(box_width):
+            if row >> (num_bits - 1 - column) & 1:
+                glyph_columns[left + column] |= 1 << y_pos
+    return glyph_columns
+
+
+# default font, characters " " to "z"
+_COLUMNS = (
+    b"\x5f\xc0\x20\x40\x60\x3c\x07\x7f\x41\x41\x7f\x04\x02\x03\x7f\x42"
+    b"\x71\x49\x56\x49\x49\x4d\x36\x0f\x10\x10\x78\x27\x49\x49\x31\x7f"
+    b"\x49\x49\x31\x69\x19\x0f\x0b\x36\x49\x49\x36\x6e\x49\x49\x3e\x28"
+    b"\xe8\x1b\x55\x13\x40\x70\x0e\x09\x09\x7e\x40\x7f\x49\x49\x49\x36"
+    b"\x3e\x63\x41\x41\x22\x7f\x41\x41\x22\x1c\x7f\x49\x49\x41\x7f\x09"
+    b"\x09\x01\x3e\x41\x51\x31\x76\x7f\x08\x08\x08\x7f\x7f\x23\x41\x41"
+    b"\x3f\x7f\x08\x14\x63\x7f\x40\x40\x40\x7f\x06\x08\x06\x7f\x7f\x06"
+    b"\x18\x7f\x3e\x63\x41\x63\x3e\x7f\x09\x09\x09\x06\x3e\x63\x51\x23"
+    b"\x5e\x7f\x09\x19\x66\x26\x45\x49\x51\x32\x01\x01\x7f\x01\x01\x3f"
+    b"\x60\x20\x7f\x01\x3f\x40\x3f\x01\x1f\x70\x1b\x70\x1f\x41\x37\x08"
+    b"\x36\x61\x01\x02\x7c\x03\x61\x19\x4d\x4b\x43\x30\x48\x48\x30\x78"
+    b"\x7f\x48\x48\x30\x30\x48\x48\x30\x48\x00\x7f\x38\x54\x54\x58\x08"
+    b"\x7f\x09\x01\xb8\xa8\xf8\x7f\x08\x08\x78\x7a\x80\xfa\x7f\x20\x58"
+    b"\x3f\x40\x40\x78\x10\x70\x10\x70\x78\x10\x70\x70\x48\x48\x10\x20"
+    b"\x78\x28\x28\x10\x10\x28\x28\xf8\x78\x10\x08\x58\x38\x68\x04\x7f"
+    b"\x04\x38\x40\x20\x78\x18\x60\x18\x18\x60\x10\x60\x18\x58\x20\x58"
+    b"\xb8\xa0\xf8\x48\x68\x58\x48"
+)
+
+_STARTS = a.array("H", (
+    0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 3, 3, 4,
+    7, 11, 15, 19, 23, 27, 31, 35, 39, 43, 47, 48, 49, 49, 49, 49,
+    52, 52, 59, 64, 69, 74, 78, 82, 87, 92, 93, 97, 101, 105, 110, 114,
+    119, 124, 129, 133, 138, 143, 147, 152, 157, 162, 166, 171, 171, 171, 171, 171,
+    171, 171, 176, 180, 183, 187, 191, 195, 198, 202, 203, 205, 208, 211, 216, 219,
+    224, 228, 232, 235, 238, 241, 245, 248, 253, 256, 259,
+))
+
+_WIDTHS = (
+    b"\x00\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x02\x00\x01\x03"
+    b"\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x01\x01\x00\x00\x00\x03"
+    b"\x00\x07\x05\x05\x05\x04\x04\x05\x05\x01\x04\x04\x04\x05\x04\x05"
+    b"\x05\x05\x04\x05\x05\x04\x05\x05\x05\x04\x05\x00\x00\x00\x00\x00"
+    b"\x00\x05\x04\x03\x04\x04\x04\x03\x04\x01\x02\x03\x03\x05\x03\x05"
+    b"\x04\x04\x03\x03\x03\x04\x03\x05\x03\x03\x04"
+)
+
+_ADVANCES = (
+    b"\x01\x02\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x02\x00\x02\x04"
+    b"\x05\x05\x05\x05\x05\x05\x05\x05\x05\x05\x02\x02\x00\x00\x00\x04"
+    b"\x00\x08\x06\x06\x06\x05\x05\x06\x06\x02\x05\x05\x06\x06\x05\x06"
+    b"\x06\x06\x05\x06\x06\x05\x06\x06\x05\x05\x06\x00\x00\x00\x00\x00"
+    b"\x00\x06\x05\x04\x05\x05\x05\x04\x05\x02\x03\x04\x04\x06\x04\x05"
+    b"\x05\x06\x04\x04\x04\x05\x04\x06\x04\x04\x05"
+)
+
+DEFAULT_FONT = Font(_COLUMNS, _STARTS, _WIDTHS, _ADVANCES)
+
+
+def run_checks():
+    """
+    behavior checks of load_bdf with a tiny font, needs CPython
+    :return: None
+    """
+    import os
+    import tempfile
+
+    bdf = ("STARTFONT 2.1\nFONTBOUNDINGBOX 3 8 0 -1\nCHARS 1\n"
+           "STARTCHAR A\nENCODING 65\nDWIDTH 4 0\nBBX 3 3 0 0\nBITMAP\n40\nA0\nE0\nENDCHAR\nENDFONT\n")
+    path = os.path.join(tempfile.mkdtemp(), "check.bdf")
+    with open(path, "w") as bdf_file:
+        bdf_file.write(bdf)
+    font = load_bdf(path)
+    os.remove(path)
+
+    assert font.first_char == 65
+    assert font.index("B") == -1
+    # rows 4 to 6 above the baseline in row 7, the advance is DWIDTH
+    assert font.glyph("A") == (0, 3, 4)
+    assert font.columns == b"\x60\x50\x60"
+    print("Font checks passed!")
+
+
+if __name__ == "__main__":
+
+    run_checks()
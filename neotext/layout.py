@@ -0,0 +1,152 @@
+"""
+measuring and laying out texts by the width tables of a font, without rendering any pixels
+author: Sebastian Heiden
+"""
+
+import font as f
+
+
+def measure(text, font=f.DEFAULT_FONT):
+    """
+    x-offset of the next letter after writing text, the offset write moves on by
+    :type text: string
+    :type font: Font
+    :return: int number of columns
+    """
+    advances = font.advances
+    width = 0
+    for letter in text:
+        code = font.index(letter)
+        if code >= 0:
+            width = width + advances[code]
+    return width
+
+
+def ink_width(text, font=f.DEFAULT_FONT):
+    """
+    number of columns from the first column of text to its last lit column, without the spacing behind it
+    :type text: string
+    :type font: Font
+    :return: int number of columns
+    """
+    width = 0
+    x_offset = 0
+    for letter in text:
+        code = font.index(letter)
+        if code < 0:
+            continue
+        if font.widths[code]:
+            width = max(width, x_offset + font.widths[code])
+        x_offset = x_offset + font.advances[code]
+    return width
+
+
+def fits(text, width, font=f.DEFAULT_FONT):
+    """
+    :type text: string
+    :type width: int number of columns available, e.g. NeoWrite.num_columns
+    :type font: Font
+    :return: bool True if text can be shown without scrolling
+    """
+    return ink_width(text, font) <= width
+
+
+def align(text, width, font=f.DEFAULT_FONT, alignment="LEFT"):
+    """
+    x-position to write text at, to align it within width columns
+    :type text: string
+    :type width: int number of columns available
+    :type font: Font
+    :type alignment: str LEFT, CENTER or RIGHT
+    :return: int x-position, 0 if text does not fit
+    """
+    assert alignment.upper() == "LEFT" or alignment.upper() == "CENTER" or alignment.upper() == "RIGHT"
+
+    free = width - ink_width(text, font)
+    if free <= 0 or alignment.upper() == "LEFT":
+        return 0
+    if alignment.upper() == "CENTER":
+        return free // 2
+    return free
+
+
+def truncate(text, width, font=f.DEFAULT_FONT, ellipsis="..."):
+    """
+    shorten text to fit into width columns, a shortened text ends with ellipsis
+    :type text: string
+    :type width: int number of columns available
+    :type font: Font
+    :type ellipsis: string appended to a shortened text
+    :return: string text itself if it fits, else the longest start of it with ellipsis that fits,
+             an empty string if not even the ellipsis fits
+    """
+    if fits(text, width, font):
+        return text
+
+    # the ellipsis starts at the advance of the kept letters
+    room = width - ink_width(ellipsis, font)
+    if room < 0:
+        return ""
+    x_offset = 0
+    length = 0
+    for index, letter in enumerate(text):
+        code = font.index(letter)
+        if code < 0:
+            continue
+        if x_offset + font.advances[code] > room:
+            break
+        x_offset = x_offset + font.advances[code]
+        length = index + 1
+    return text[:length] + ellipsis
+
+
+def fit(text, width, fonts):
+    """
+    choose the first font of fonts, in which text fits into width columns
+    :type text: string
+    :type width: int number of columns available
+    :type fonts: sequence of Font, e.g. from the widest to the narrowest
+    :return: Font or None if text fits into none of them
+    """
+    for font in fonts:
+        if fits(text, width, font):
+            return font
+    return None
+
+
+def run_checks():
+    """
+    behavior checks: the measured widths agree with the pixels NeoWrite renders
+    :return: None
+    """
+    import array
+
+    import neotext as nt
+
+    for text in ("Hello World", "A", "x.!", "ij 42", ""):
+        neo = nt.NeoWrite(4, 0)
+        neo.write(text)
+        assert measure(text) == neo.offset, text
+        stored = neo.pixel_x_y_color
+        lit = max(stored[0::2]) + 1 if stored else 0
+        assert ink_width(text) == lit, text
+        assert fits(text, neo.num_columns) == (lit <= neo.num_columns)
+
+    assert align("A", 32, alignment="RIGHT") == 32 - ink_width("A")
+    assert align("A", 32, alignment="CENTER") == (32 - ink_width("A")) // 2
+    assert align("Hello World", 8, alignment="RIGHT") == 0
+    short = truncate("Hello World", 24)
+    assert short.endswith("...") and fits(short, 24)
+    # one more letter would not fit
+    assert not fits("Hello World"[:len(short) - 2] + "...", 24)
+    assert truncate("Hi", 24) == "Hi"
+    assert truncate("Hello", 2) == ""
+    narrow = f.Font(b"\x7f", array.array("H", (0,) * 91), b"\x01" * 91, b"\x02" * 91, 32)
+    assert fit("Hello World", 24, (f.DEFAULT_FONT, narrow)) is narrow
+    assert fit("Hello World", 8, (f.DEFAULT_FONT, narrow)) is None
+    print("Layout checks passed!")
+
+
+if __name__ == "__main__":
+
+    run_checks()
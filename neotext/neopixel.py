@@ -94,7 +94,18 @@ class NeoPixel:
         else:
             self.order = pixel_order
             self.bpp = len(self.order)
+        # double buffered: pixels are written into the back buffer buf, show() publishes it by
+        # swapping it with the front buffer, which holds the last transmitted frame
         self.buf = bytearray(self.n * self.bpp)
+        self._front = bytearray(self.n * self.bpp)
+        # byte range of buf changed since the last show()
+        self._dirty_start = 0
+        self._dirty_stop = len(self.buf)
+        self.frames_sent = 0
+        self.frames_suppressed = 0
+        self.bytes_sent = 0
+        # receives every transmitted frame instead of the LEDs, see emulator.Emulator
+        self.emulator = None
         # Set auto_write to False temporarily so brightness setter does _not_
         # call show() while in __init__.
         self.auto_write = False
@@ -105,6 +116,7 @@ class NeoPixel:
         """Blank out the NeoPixels and release the pin."""
         for i in range(len(self.buf)):
             self.buf[i] = 0
+        self.mark_dirty()
         # neopixel_write(self.pin, self.buf)
         # self.pin.deinit()
 
@@ -117,12 +129,7 @@ class NeoPixel:
     def __repr__(self):
         return "[" + ", ".join([str(x) for x in self]) + "]"
 
-    def _set_item(self, index, value):
-        if index < 0:
-            index += len(self)
-        if index >= self.n or index < 0:
-            raise IndexError
-        offset = index * self.bpp
+    def _components(self, value):
         r = 0
         g = 0
         b = 0
@@ -144,11 +151,50 @@ class NeoPixel:
                 r, g, b = value
             else:
                 r, g, b, w = value
+        return r, g, b, w
+
+    def _pixel_bytes(self, value):
+        """One pixel of the given color in wire order."""
+        r, g, b, w = self._components(value)
+        pixel = bytearray(self.bpp)
+        pixel[self.order[0]] = r
+        pixel[self.order[1]] = g
+        pixel[self.order[2]] = b
+        if self.bpp == 4:
+            pixel[self.order[3]] = w
+        return pixel
+
+    def _set_item(self, index, value):
+        if index < 0:
+            index += len(self)
+        if index >= self.n or index < 0:
+            raise IndexError
+        offset = index * self.bpp
+        r, g, b, w = self._components(value)
         self.buf[offset + self.order[0]] = r
         self.buf[offset + self.order[1]] = g
         self.buf[offset + self.order[2]] = b
         if self.bpp == 4:
             self.buf[offset + self.order[3]] = w
+        if offset < self._dirty_start:
+            self._dirty_start = offset
+        if offset + self.bpp > self._dirty_stop:
+            self._dirty_stop = offset + self.bpp
+
+    def mark_dirty(self, start=0, stop=None):
+        """Marks the bytes ``buf[start:stop]`` as changed. Must be called after writing into
+        ``buf`` directly, otherwise ``show`` may skip the change."""
+        if stop is None:
+            stop = len(self.buf)
+        if start < self._dirty_start:
+            self._dirty_start = start
+        if stop > self._dirty_stop:
+            self._dirty_stop = stop
+
+    @property
+    def dirty(self):
+        """True if the buffer may differ from the last transmitted frame."""
+        return self._dirty_stop > self._dirty_start
 
     def __setitem__(self, index, val):
         if isinstance(index, slice):
@@ -156,6 +202,22 @@ class NeoPixel:
             length = stop - start
             if step != 0:
                 length = math.ceil(length / step)
+            if isinstance(val, (bytes, bytearray, memoryview)):
+                # bytes-like sources are already in wire order
+                if len(val) != length * self.bpp:
+                    raise ValueError("Slice and input sequence size do not match.")
+                if step == 1:
+                    self.buf[start * self.bpp:stop * self.bpp] = val
+                else:
+                    for val_i, in_i in enumerate(range(start, stop, step)):
+                        self.buf[in_i * self.bpp:(in_i + 1) * self.bpp] = \
+                            val[val_i * self.bpp:(val_i + 1) * self.bpp]
+                if length > 0:
+                    last = start + (length - 1) * step
+                    self.mark_dirty(min(start, last) * self.bpp, (max(start, last) + 1) * self.bpp)
+                if self.auto_write:
+                    self.show()
+                return
             if len(val) != length:
                 raise ValueError("Slice and input sequence size do not match.")
             for val_i, in_i in enumerate(range(start, stop, step)):
@@ -193,18 +255,23 @@ class NeoPixel:
     def brightness(self, brightness):
         # pylint: disable=attribute-defined-outside-init
         self._brightness = min(max(brightness, 0.0), 1.0)
+        # translation table applied to every byte of the buffer in show()
+        if self._brightness > 0.99:
+            self._brightness_table = None
+        else:
+            self._brightness_table = bytes(int(i * self._brightness) for i in range(256))
+        # the buffer stays the same, but every pixel has to be sent again
+        self._retransmit = True
+        self.mark_dirty()
         if self.auto_write:
             self.show()
 
     def fill(self, color):
         """Colors all pixels the given ***color***."""
-        auto_write = self.auto_write
-        self.auto_write = False
-        for i, _ in enumerate(self):
-            self[i] = color
-        if auto_write:
+        self.buf[:] = self._pixel_bytes(color) * self.n
+        self.mark_dirty()
+        if self.auto_write:
             self.show()
-        self.auto_write = auto_write
 
     def write(self):
         """.. deprecated: 1.0.0
@@ -215,10 +282,60 @@ class NeoPixel:
         """Shows the new colors on the pixels themselves if they haven't already
         been autowritten.
         The colors may or may not be showing after this function returns because
-        it may be done asynchronously."""
-        """
-        if self.brightness > 0.99:
-            neopixel_write(self.pin, self.buf)
+        it may be done asynchronously.
+        Frames without changes since the last ``show`` are not transmitted. Otherwise the chain is
+        only written up to the last changed pixel, the pixels behind keep their colors.
+        The finished frame becomes the front buffer by swapping the buffers, ``buf`` is a different
+        bytearray afterwards. Only the changed bytes are brought up to date in the new back buffer,
+        so it holds the shown frame again for the next changes."""
+        start = self._dirty_start
+        stop = self._changed_stop()
+        self._dirty_start = len(self.buf)
+        self._dirty_stop = 0
+        self._retransmit = False
+        if not stop:
+            self.frames_suppressed += 1
+            return
+
+        self.buf, self._front = self._front, self.buf
+        self.frames_sent += 1
+        self.bytes_sent += stop
+        if self._brightness_table is None:
+            wire = memoryview(self._front)[:stop]
         else:
-            neopixel_write(self.pin, bytearray([int(i * self.brightness) for i in self.buf]))
-        """
\ No newline at end of file
+            wire = self._front[:stop].translate(self._brightness_table)
+        if self.frames_sent == 1:
+            start = 0
+        self._transmit(wire, start)
+        self.buf[start:stop] = memoryview(self._front)[start:stop]
+
+    def _transmit(self, wire, start):
+        """Sends ``wire``, the data of the chain from the first pixel on. The bytes before
+        ``start`` are the same as in the last frame. Output transports replace this method."""
+        # neopixel_write(self.pin, wire)
+        if self.emulator is not None:
+            self.emulator.receive(wire)
+
+    def _changed_stop(self):
+        """End of the last pixel in the dirty range, which differs from the last transmitted
+        frame, 0 if nothing changed."""
+        start = self._dirty_start
+        stop = self._dirty_stop
+        if stop <= start:
+            return 0
+        if self.frames_sent == 0 or self._retransmit:
+            # the colors of the chain are unknown before the first frame or after a new brightness
+            return len(self.buf)
+
+        buf = memoryview(self.buf)
+        shown = memoryview(self._front)
+        if buf[start:stop] == shown[start:stop]:
+            return 0
+        # bisect for the shortest stop, which still transmits every changed byte
+        while stop - start > 1:
+            middle = (start + stop) // 2
+            if buf[middle:stop] == shown[middle:stop]:
+                stop = middle
+            else:
+                start = middle
+        return -(-stop // self.bpp) * self.bpp
\ No newline at end of file
@@ -1,5 +1,5 @@
 """
-writing texts with up to 4  chained neopixel 8x8 matrices
+writing texts with chained neopixel 8x8 matrices, arranged in a grid
 author: Sebastian Heiden
 """
 
@@ -8,7 +8,10 @@ import array as a
 import time
 
 import board as b
+import cache
+import font as f
 import neopixel
+import sharded
 
 
 class COLORS:
@@ -65,6 +68,14 @@ class Color:
         return red, green, blue
 
 
+def _ignore_dirty(start=0, stop=None):
+    """
+    stands in for mark_dirty of neopixel drivers, which do not track changes and send the whole buffer
+    :return: None
+    """
+    return
+
+
 def _square(base):
     """
     squares param base
@@ -77,36 +88,107 @@ def _square(base):
 
 class NeoWrite:
     """
-    class to Write text on up to four
+    class to Write text on a grid of
     neopixel matrices
     """
 
-    def __init__(self, num_tiles, pin, back_color=Color(COLORS.BLACK), intensity=5, orientation="ZIGZAG"):
+    def __init__(self, num_tiles, pin, back_color=Color(COLORS.BLACK), intensity=5, orientation="ZIGZAG",
+                 cache_bytes=2048, gc_every=1, tile_rows=1, tile_layout=None, profile=False):
         """
-        :type num_tiles: int number of neopixel matrices
-        :type pin: pin
+        :type num_tiles: int number of neopixel matrices in each row of the grid
+        :type pin: pin or sequence of pins, the chain is then split evenly (in whole matrices) onto the pins,
+                    or an object with the interface of NeoPixel for all pixels, e.g. ddp.DDPPixels
         :type back_color: Color
         :type intensity: int
+        :type cache_bytes: int RAM budget for rendered texts, which are reused by write, 0 disables the cache
+        :type gc_every: int run the garbage collector after every gc_every shown frames, 0 never runs it
+        :type tile_rows: int number of rows of matrices in the grid
+        :type tile_layout: sequence of (tile_x, tile_y) positions of the matrices in the order of the chain,
+                           defaults to row by row from the upper left matrix
+        :type profile: bool measure the duration of the stages of each frame, see stats()
         """
-        assert num_tiles <= 4
         assert num_tiles > 0
+        assert tile_rows > 0
+        assert tile_rows <= 32, "the stored pixels keep y in one byte"
+        assert num_tiles * tile_rows * 64 <= 0x10000
         assert intensity >= 0
         assert intensity <= 100
         assert orientation.upper() == "ZIGZAG" or orientation.upper() == "LINE"
         assert back_color.to_int() <= 0xFFFFFF
         assert back_color.to_int() >= 0
+        assert gc_every >= 0
 
         self.offset = 0
-        self.num_pixels = num_tiles * 64
+        self.num_pixels = num_tiles * tile_rows * 64
+        self.num_columns = num_tiles * 8
+        self.num_rows = tile_rows * 8
         self.orientation = orientation.upper()
-        self.neopixels = neopixel.NeoPixel(pin, self.num_pixels, auto_write=False)
-        self.pixel_x_y_color = a.array("B", ())  # relay on sorting of pixels (upper left to lower right)
-        self.element_byte_size = 5
+        self.tile_chain = self._build_tile_chain(num_tiles, tile_rows, tile_layout)
+        self.led_map = self._build_led_map()
+        if hasattr(pin, "show"):
+            # an output with the interface of NeoPixel, e.g. ddp.DDPPixels
+            assert len(pin) == self.num_pixels
+            self.neopixels = pin
+        elif isinstance(pin, (list, tuple)):
+            num_matrices = num_tiles * tile_rows
+            assert len(pin) <= num_matrices
+            counts = [(num_matrices // len(pin) + (index < num_matrices % len(pin))) * 64
+                      for index in range(len(pin))]
+            self.neopixels = sharded.ShardedNeoPixel(pin, self.num_pixels, auto_write=False, counts=counts)
+        else:
+            self.neopixels = neopixel.NeoPixel(pin, self.num_pixels, auto_write=False)
+        # marks bytes written into the buffer directly as changed, the CircuitPython driver has no mark_dirty
+        self.mark_dirty = getattr(self.neopixels, "mark_dirty", _ignore_dirty)
+        # stored pixels as (x, y << 8 | palette index), only x needs more than a byte
+        # the palette holds the dimmed colors as red, green, blue
+        # and the un-dimmed source color and intensity of each entry, to dim them again
+        # sorted by column, the pixels of column x are stored from column_offsets[x] to column_offsets[x + 1]
+        self.pixel_x_y_color = a.array("H", ())
+        self.column_offsets = a.array("L", (0,))
+        self.element_byte_size = 2
+        self._clear_palette()
+        # column-major copy of the written content in wire order, scrolling only moves the viewport view_x
+        self.column_bytes = self.num_rows * self.neopixels.bpp
+        self.column_start = self._build_column_start()
+        self.canvas = bytearray()
+        self.view_x = 0
+        self.render_cache = cache.LRUCache(cache_bytes)
+        self.zero_column = bytes(self.column_bytes)
+        # dimmed background color, unlit pixels of the canvas and columns without content show it
+        self.back = (0, 0, 0)
+        self.back_column = self.zero_column
+        self.gc_every = gc_every
+        self.frame_count = 0
+        self.recorder = None
+        self.profiler = None
+        if profile:
+            self.set_profiling(True)
         if back_color != Color(COLORS.BLACK):
             self.clear(0, back_color, intensity)
         self.time_stamp = time.monotonic()
         self.max_x = 0
 
+    @staticmethod
+    def _build_tile_chain(num_tiles, tile_rows, tile_layout):
+        """
+        number the matrices of the grid by their position in the chain
+        :type num_tiles: int number of matrices in each row
+        :type tile_rows: int number of rows of matrices
+        :type tile_layout: sequence of (tile_x, tile_y) in the order of the chain or None
+        :return: array of chain positions, index tile_y * num_tiles + tile_x
+        """
+        if tile_layout is None:
+            return a.array("H", range(num_tiles * tile_rows))
+
+        assert len(tile_layout) == num_tiles * tile_rows
+        tile_chain = a.array("H", (0 for _ in range(num_tiles * tile_rows)))
+        for chain_pos, (tile_x, tile_y) in enumerate(tile_layout):
+            assert 0 <= tile_x < num_tiles
+            assert 0 <= tile_y < tile_rows
+            tile_chain[tile_y * num_tiles + tile_x] = chain_pos
+        assert len(set(tile_chain)) == len(tile_chain), "every matrix needs its own position in the chain"
+        return tile_chain
+
     def _map_led(self, x_coord, y_coord):
         """
         map the position of the LED positions to the led numbers
@@ -117,12 +199,14 @@ class NeoWrite:
         # assert y_coord >= 0
         # assert y_coord < 8, str(y_coord) + " is to high."
         # assert x_coord >= 0
-        # assert x_coord < self.num_pixels // 8
+        # assert x_coord < self.num_columns
 
         tile_size = 8
         max_index = 7
 
-        matrix_number = x_coord // tile_size
+        matrix_number = self.tile_chain[(y_coord // tile_size) * (self.num_columns // tile_size) +
+                                        x_coord // tile_size]
+        y_coord = y_coord % tile_size
 
         if (self.orientation == "ZIGZAG") and (matrix_number % 2):
             matrix_pos = x_coord % tile_size + tile_size * y_coord
@@ -131,40 +215,373 @@ class NeoWrite:
 
         return _square(tile_size) * matrix_number + matrix_pos
 
+    def _build_led_map(self):
+        """
+        precompute the LED number of every (x, y) position, so the hot paths only need a table read
+        the LED number of (x, y) is stored at index x * num_rows + y
+        :return: array of LED numbers
+        """
+        led_map = a.array("H", (0 for _ in range(self.num_pixels)))
+        for x_coord in range(self.num_columns):
+            for y_coord in range(self.num_rows):
+                led_map[x_coord * self.num_rows + y_coord] = self._map_led(x_coord, y_coord)
+        return led_map
+
+    def _build_column_start(self):
+        """
+        find the 8 pixel segments of the columns (one per row of matrices), whose LEDs are chained
+        in one piece from bottom to top, those can be copied from the canvas with a single slice assignment
+        :return: array of the first LED number of each segment, index x * tile_rows + tile_y,
+                 -1 if the segment is not chained in one piece
+        """
+        tile_rows = self.num_rows // 8
+        column_start = a.array("l", (-1 for _ in range(self.num_columns * tile_rows)))
+        for x_coord in range(self.num_columns):
+            for tile_y in range(tile_rows):
+                bottom = x_coord * self.num_rows + tile_y * 8 + 7
+                first_led = self.led_map[bottom]
+                if all(self.led_map[bottom - row] == first_led + row for row in range(8)):
+                    column_start[x_coord * tile_rows + tile_y] = first_led
+        return column_start
+
+    def _put_canvas_pixel(self, canvas, x_pos, y_pos, red, green, blue):
+        """
+        store the color of the pixel in the canvas, rows are stored from bottom (y = num_rows - 1) to top (y = 0)
+        :param canvas: bytearray column-major pixels in wire order
+        :param x_pos: int canvas column
+        :param y_pos: int from 0 to number of rows -1
+        :param red: int (byte)
+        :param green: int (byte)
+        :param blue: int (byte)
+        :return: None
+        """
+        bpp = self.neopixels.bpp
+        order = self.neopixels.order
+        needed = (x_pos + 1) * self.column_bytes
+        if len(canvas) < needed:
+            canvas.extend(bytes(needed - len(canvas)))
+
+        pos = x_pos * self.column_bytes + (self.num_rows - 1 - y_pos) * bpp
+        canvas[pos + order[0]] = red
+        canvas[pos + order[1]] = green
+        canvas[pos + order[2]] = blue
+
+    def _set_back(self, back):
+        """
+        :type back: tuple (red, green, blue) dimmed background color
+        :return: None
+        """
+        pixel = bytearray(self.neopixels.bpp)
+        for channel in range(3):
+            pixel[self.neopixels.order[channel]] = back[channel]
+        self.back = back
+        self.back_column = bytes(pixel) * self.num_rows
+
+    def _extend_canvas(self, columns):
+        """
+        widen the canvas to columns columns, the new columns show the background
+        :type columns: int number of columns
+        :return: None
+        """
+        missing = columns - len(self.canvas) // self.column_bytes
+        if missing > 0:
+            self.canvas.extend(self.back_column * missing)
+
+    def _clear_palette(self):
+        self.palette = a.array("B", ())
+        self.palette_source = a.array("L", ())
+        self.palette_intensity = a.array("B", ())
+        self.palette_lookup = {}  # source color << 8 | intensity -> palette index
+
+    def _palette_index(self, color, intensity):
+        """
+        find the palette entry of a color, a new entry is added for a new color
+        :type color: Color un-dimmed color
+        :type intensity: int max. intensity
+        :return: int palette index
+        """
+        key = color.to_int() << 8 | intensity
+        index = self.palette_lookup.get(key)
+        if index is None:
+            index = len(self.palette_source)
+            assert index <= 0xFF, "the stored pixels keep the palette index in one byte"
+            self.palette.extend(a.array("B", Color.intensity(color, intensity)))
+            self.palette_source.append(color.to_int())
+            self.palette_intensity.append(intensity)
+            self.palette_lookup[key] = index
+        return index
+
+    def _set_palette_color(self, index, color, intensity):
+        """
+        change palette entry index to color and intensity, if another entry has this color and intensity
+        already, the pixels of index are given to that entry instead
+        :type index: int palette index
+        :type color: Color un-dimmed color
+        :type intensity: int max. intensity
+        :return: int palette index of the pixels of index afterwards
+        """
+        key = color.to_int() << 8 | intensity
+        other = self.palette_lookup.get(key)
+        if other is not None and other != index:
+            self._remap_palette(index, other)
+            return other
+
+        red, green, blue = Color.intensity(color, intensity)
+        self.palette[index * 3] = red
+        self.palette[index * 3 + 1] = green
+        self.palette[index * 3 + 2] = blue
+        self.palette_source[index] = color.to_int()
+        self.palette_intensity[index] = intensity
+        self.palette_lookup[key] = index
+        return index
+
+    def _remap_palette(self, index, other):
+        """
+        give the stored pixels of palette entry index the entry other, index is not used any more
+        :type index: int palette index
+        :type other: int palette index
+        :return: None
+        """
+        stored = self.pixel_x_y_color
+        for pos in range(1, len(stored), self.element_byte_size):
+            if stored[pos] & 0xFF == index:
+                stored[pos] = stored[pos] & 0xFF00 | other
+
+    def _dim_palette(self, intensity):
+        """
+        dim all palette entries again from their source colors
+        :type intensity: int max. intensity
+        :return: None
+        """
+        # the entries may merge, so the lookup is built anew
+        self.palette_lookup = {}
+        for index in range(len(self.palette_source)):
+            self._set_palette_color(index, Color(self.palette_source[index]), intensity)
+
+    def _repaint(self, index=None):
+        """
+        paint the stored pixels of the columns with pixels of palette entry index (all for None) with their
+        palette colors into the canvas, in stored order, so pixels written later stay on top
+        :type index: int or None
+        :return: None
+        """
+        stored = self.pixel_x_y_color
+        offsets = self.column_offsets
+        palette = self.palette
+        size = self.element_byte_size
+        for x_pos in range(len(offsets) - 1):
+            first = offsets[x_pos]
+            last = offsets[x_pos + 1]
+            if index is not None and not any(stored[pos] & 0xFF == index for pos in range(first + 1, last, size)):
+                continue
+            for pos in range(first, last, size):
+                color = (stored[pos + 1] & 0xFF) * 3
+                self._put_canvas_pixel(self.canvas, x_pos, stored[pos + 1] >> 8, palette[color],
+                                       palette[color + 1], palette[color + 2])
+
+    def recolor(self, color, new_color, intensity=5, new_intensity=None):
+        """
+        change everything written with color and intensity to new_color and new_intensity
+        only the palette entry changes and its pixels are painted again, nothing is rendered again
+        :type color: Color color used for writing
+        :type new_color: Color
+        :type intensity: int max. intensity used for writing
+        :type new_intensity: int or None to keep intensity
+        :return: None
+        """
+        if new_intensity is None:
+            new_intensity = intensity
+        assert new_intensity >= 0
+        assert new_intensity <= 100
+
+        index = self.palette_lookup.pop(color.to_int() << 8 | intensity, None)
+        if index is None:
+            return
+
+        index = self._set_palette_color(index, new_color, new_intensity)
+        self._repaint(index)
+        self._render_view()
+        self._show()
+
+    def _render_view(self):
+        """
+        copy the visible columns of the canvas, starting with column view_x, into the neopixel buffer
+        :return: None
+        """
+        buf = self.neopixels.buf
+        bpp = self.neopixels.bpp
+        column_bytes = self.column_bytes
+        # the view ends with this method, the canvas can grow again afterwards, CircuitPython has no release()
+        canvas = memoryview(self.canvas)
+        back_column = memoryview(self.back_column)
+        canvas_columns = len(self.canvas) // column_bytes
+        width = max(self.max_x, self.num_columns)
+
+        num_rows = self.num_rows
+        tile_rows = num_rows // 8
+        segment_bytes = 8 * bpp
+
+        for x_pos in range(self.num_columns):
+            src_x = (self.view_x + x_pos) % width
+            for tile_y in range(tile_rows):
+                first_led = self.column_start[x_pos * tile_rows + tile_y]
+                # canvas rows of this segment, from bottom to top
+                first_row = num_rows - 8 - tile_y * 8
+                if src_x >= canvas_columns:
+                    # nothing written in this column
+                    source = back_column
+                    src = first_row * bpp
+                else:
+                    source = canvas
+                    src = src_x * column_bytes + first_row * bpp
+                if first_led >= 0:
+                    buf[first_led * bpp:first_led * bpp + segment_bytes] = source[src:src + segment_bytes]
+                else:
+                    for row in range(8):
+                        pos = self.led_map[x_pos * num_rows + num_rows - 1 - first_row - row] * bpp
+                        buf[pos:pos + bpp] = source[src + row * bpp:src + (row + 1) * bpp]
+        self.mark_dirty()
+
+    def _show(self):
+        """
+        show the neopixel buffer and run the garbage collector according to gc_every
+        :return: None
+        """
+        if self.recorder is not None:
+            self.recorder.add(self.neopixels.buf)
+        self._transmit()
+        self.frame_count = self.frame_count + 1
+        if self.gc_every and not self.frame_count % self.gc_every:
+            self._collect()
+
+    def _transmit(self):
+        self.neopixels.show()
+
+    def _collect(self):
+        gc.collect()
+
+    # stage name and method, measured while profiling
+    PROFILED_STAGES = (
+        ("glyph", "_rasterize"),  # glyph lookup and rendering of a text
+        ("map", "_render_view"),  # mapping the viewport onto the LEDs
+        ("write", "_NeoWrite__put_pixel"),  # buffer write of a single pixel
+        ("show", "_transmit"),
+        ("gc", "_collect"),
+    )
+
+    def set_profiling(self, enabled):
+        """
+        switch the measurement of the stages on or off, the measured methods are replaced by
+        measuring wrappers, so without profiling nothing is measured and nothing is paid
+        :type enabled: bool
+        :return: None
+        """
+        if enabled == (self.profiler is not None):
+            return
+        if enabled:
+            import profiler
+
+            self.profiler = profiler.Profiler()
+            for stage, name in self.PROFILED_STAGES:
+                setattr(self, name, self.profiler.wrap(stage, getattr(self, name)))
+        else:
+            for _, name in self.PROFILED_STAGES:
+                delattr(self, name)
+            self.profiler = None
+
+    def stats(self):
+        """
+        statistics since the last reset_stats(): shown frames, render cache and with profiling
+        count, duration (us) and log2 histogram of the durations of each stage
+        :return: dict
+        """
+        return {
+            "frames": self.frame_count,
+            "cache": {
+                "hits": self.render_cache.hits,
+                "misses": self.render_cache.misses,
+                "evictions": self.render_cache.evictions,
+                "size": self.render_cache.size,
+            },
+            "stages": self.profiler.stats() if self.profiler is not None else {},
+        }
+
+    def reset_stats(self):
+        """
+        set all counters of stats() to 0
+        :return: None
+        """
+        self.frame_count = 0
+        self.render_cache.hits = 0
+        self.render_cache.misses = 0
+        self.render_cache.evictions = 0
+        if self.profiler is not None:
+            self.profiler.reset()
+
+    def record(self, path, fps=10.0, compress=True):
+        """
+        record every following frame into the file path, until stop_recording() is called
+        the file can be played back with recording.FramePlayer
+        :type path: str file to write
+        :type fps: float frame rate of the playback
+        :type compress: bool run length encode the frames
+        :return: None
+        """
+        import recording
+
+        self.stop_recording()
+        self.recorder = recording.FrameRecorder(path, self.neopixels, fps, compress)
+
+    def stop_recording(self):
+        """
+        finish the recording started by record()
+        :return: None
+        """
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+
     def reset(self, in_num=0, back_color=Color(COLORS.BLACK), foreground_color=Color(COLORS.WHITE), intensity=5):
         """
         Resetting the global offset value to inNum, with back_color as color of the background
-        foreground_color as color of the foreground and intensity as the overall max. intensity of each LED
+        and intensity as the overall max. intensity of each LED
+        the written pixels keep their colors, they are dimmed again from their un-dimmed source colors,
+        without rendering the text again
         :type in_num: int selectable offset in x-position
-        :type back_color: int color code
-        :type foreground_color: int color code
+        :type back_color: Color color of the background
+        :type foreground_color: Color unused, the written pixels keep their own colors
         :type intensity: int max intensity of LED in percentage
         :return: None
         """
         assert in_num >= 0
-        assert in_num < self.num_pixels // 8
+        assert in_num < self.num_columns
         assert intensity >= 0
         assert intensity <= 100
-        assert back_color <= 0xFFFFFF
-        assert back_color >= 0
+        assert back_color.to_int() <= 0xFFFFFF
+        assert back_color.to_int() >= 0
         assert foreground_color.to_int() <= 0xFFFFFF
         assert foreground_color.to_int() >= 0
 
         self.offset = in_num
+        self._dim_palette(intensity)
+        self._set_back(Color.intensity(back_color, intensity))
+        self.canvas = bytearray(self.back_column * (len(self.canvas) // self.column_bytes))
+        self._repaint()
 
-        foreground_index = 0
-        for index in range(0, self.num_pixels):
-            # find out whether LED is in foreground or not
-            next_foreground_led_num = self._map_led(self.pixel_x_y_color[foreground_index],
-                                                    self.pixel_x_y_color[foreground_index + 1])
-            if index < next_foreground_led_num:
-                self.neopixels[index] = Color.intensity(back_color, intensity)
-            elif index == next_foreground_led_num:
-                self.neopixels[index] = Color.intensity(self.neopixels[foreground_index], intensity)
-                foreground_index = foreground_index + self.element_byte_size
-            # index should logically not be able to be be larger than compare value
+        self._render_view()
+        self._show()
 
-        self.neopixels.show()
+    def set_brightness(self, brightness):
+        """
+        dim the whole display, background included, by the neopixel driver while sending the frame
+        nothing is rendered again and the stored colors do not change
+        :type brightness: float from 0.0 to 1.0
+        :return: None
+        """
+        assert 0.0 <= brightness <= 1.0
+
+        self.neopixels.brightness = brightness
+        self._show()
 
     def clear(self, in_num=0, back_color=Color(COLORS.BLACK), intensity=0):
         """
@@ -176,7 +593,7 @@ class NeoWrite:
         :return: None
         """
         assert in_num >= 0
-        assert in_num < self.num_pixels // 8
+        assert in_num < self.num_columns
         assert intensity >= 0
         assert intensity <= 100
         assert back_color.to_int() <= 0xFFFFFF
@@ -184,29 +601,119 @@ class NeoWrite:
 
         self.offset = in_num
 
-        for index in range(self.offset, self.num_pixels):
-            self.neopixels[index] = Color.intensity(back_color, intensity)
-
-        self.pixel_x_y_color = a.array("B", ())
+        back = Color.intensity(back_color, intensity)
+        self._set_back(back)
+        if self.offset == 0:
+            self.neopixels.fill(back)
+        else:
+            for index in range(self.offset, self.num_pixels):
+                self.neopixels[index] = back
+
+        self.pixel_x_y_color = a.array("H", ())
+        self.column_offsets = a.array("L", (0,))
+        self._clear_palette()
+        self.canvas = bytearray()
+        self.view_x = 0
         self.max_x = self.offset
-        self.neopixels.show()
+        self._show()
 
-    def write(self, text, color=Color(COLORS.WHITE), intensity=5):
+    def write(self, text, color=Color(COLORS.WHITE), intensity=5, font=f.DEFAULT_FONT, line=0):
         """
         Writes the given text to the Neopixel Matrix with:
         :type text: string text to be written
         :type color: int color code for the LEDs
         :type intensity: int max. intensity for each LED
+        :type font: Font bitmap font of the text
+        :type line: int row of matrices to write into, 0 is the top row
         :return: None
         """
         assert color.to_int() <= 0xFFFFFF
         assert color.to_int() >= 0
         assert intensity >= 0
         assert intensity <= 100
+        assert 0 <= line < self.num_rows // 8
+
+        key = (text, color.to_int(), intensity, font, line)
+        rendered = self.render_cache.get(key)
+        if rendered is None:
+            rendered = self._rasterize(text, color, intensity, font, line * 8)
+            self.render_cache.put(key, rendered, len(rendered[0]) + 2 * len(rendered[1]))
+
+        self._blit(rendered, self._palette_index(color, intensity))
+
+    def _rasterize(self, text, color, intensity, font, y_offset=0):
+        """
+        render the text into a column strip starting at x-position 0, independent of the current offset
+        :type text: string text to be rendered
+        :type color: Color color of the LEDs
+        :type intensity: int max. intensity for each LED
+        :type font: Font bitmap font of the text
+        :type y_offset: int row of the top of the letters
+        :return: tuple (bytearray column-major strip in wire order, array (x, y << 8) of the lit pixels,
+                 int x-offset of the next letter)
+        """
+        red, green, blue = Color.intensity(color, intensity)
+        columns = font.columns
+        strip = bytearray()
+        pixels = a.array("H", ())
+        x_offset = 0
+        last_x = 0
 
         for letter in text:
-            pixels, next_offset = _get_pixel(letter, self.offset)
-            self.write_raw(pixels, next_offset, color, intensity)
+            code = font.index(letter)
+            if code < 0:
+                continue
+            start = font.starts[code]
+            for column_index in range(font.widths[code]):
+                column = columns[start + column_index]
+                x_pos = x_offset + column_index
+                if column and x_pos < last_x:
+                    # a glyph wider than its advance reaches into the next one, the pixels need sorting
+                    last_x = -1
+                for row in range(8):
+                    if column >> row & 1:
+                        y_pos = y_offset + row
+                        self._put_canvas_pixel(strip, x_pos, y_pos, red, green, blue)
+                        pixels.append(x_pos)
+                        pixels.append(y_pos << 8)  # palette index 0, set by _blit
+                if column and last_x >= 0:
+                    last_x = x_pos
+            x_offset = x_offset + font.advances[code]
+
+        if last_x < 0:
+            pixels = self._sort_by_column(pixels)
+        return strip, pixels, x_offset
+
+    def _blit(self, rendered, color_index):
+        """
+        copy a strip made by _rasterize to the current offset and put it onto the display
+        :param rendered: tuple returned by _rasterize
+        :param color_index: int palette index of the color of the strip
+        :return: None
+        """
+        strip, pixels, advance = rendered
+        start = self.offset
+
+        records = a.array("H", pixels)
+        for index in range(0, len(records), self.element_byte_size):
+            records[index] = records[index] + start
+            records[index + 1] = records[index + 1] | color_index
+        self._add_pixels(records)
+
+        if strip:
+            self.max_x = max(self.max_x, start + len(strip) // self.column_bytes + 1)
+            self._extend_canvas(start)
+            if len(self.canvas) == start * self.column_bytes and not any(self.back):
+                self.canvas.extend(strip)
+            else:
+                # columns already in use or a background, only the lit pixels may be overwritten
+                self._extend_canvas(start + len(strip) // self.column_bytes)
+                red, green, blue = self.palette[color_index * 3:color_index * 3 + 3]
+                for index in range(0, len(records), self.element_byte_size):
+                    self._put_canvas_pixel(self.canvas, records[index], records[index + 1] >> 8, red, green, blue)
+
+        self.__put_pixels(start, start + len(strip) // self.column_bytes)
+        self.offset = start + advance
 
     def write_raw(self, raw_position_list, next_offset, color=Color(COLORS.WHITE), intensity=5):
         """
@@ -222,52 +729,175 @@ class NeoWrite:
         assert color.to_int() <= 0xFFFFFF
         assert color.to_int() >= 0
 
-        local_array = a.array("B", ())
+        color_index = self._palette_index(color, intensity)
+        palette = self.palette
+        red = palette[color_index * 3]
+        green = palette[color_index * 3 + 1]
+        blue = palette[color_index * 3 + 2]
 
+        if len(raw_position_list):
+            self._extend_canvas(max(raw_position_list[0::2]) + self.offset + 1)
+        records = a.array("H", ())
         for index in range(0, len(raw_position_list), 2):
             # get x- and y-Position form array
-            x_pos = raw_position_list[index]
-            # if x_pos > self.max_x:
-            #    self.max_x = x_pos
-            if self.offset + x_pos + 2 > self.max_x:
-                self.max_x = x_pos + self.offset + 2
+            x_pos = raw_position_list[index] + self.offset
             y_pos = raw_position_list[index + 1]
+            if x_pos + 2 > self.max_x:
+                self.max_x = x_pos + 2
+            records.append(x_pos)
+            records.append(y_pos << 8 | color_index)
+            self._put_canvas_pixel(self.canvas, x_pos, y_pos, red, green, blue)
+
+        if records:
+            # safe for redrawing, sorted by column
+            size = self.element_byte_size
+            self._add_pixels(self._sort_by_column(records))
+
+            # "put" the result onto the LED MATRIX
+            self.__put_pixels(min(records[0::size]), max(records[0::size]) + 1)
+        else:
+            self._show()
+        self.offset = next_offset
 
-            # safe for redrawing
-            self.pixel_x_y_color.append(x_pos + self.offset)
-            local_array.append(x_pos + self.offset)
-            self.pixel_x_y_color.append(y_pos)
-            local_array.append(y_pos)
-
-            # set color
-            red, green, blue = Color.intensity(color, intensity)
-            self.pixel_x_y_color.append(red)
-            local_array.append(red)
+    def _sort_by_column(self, records):
+        """
+        :param records: array (x, y << 8 | palette index) of pixels
+        :return: array of the records sorted by x, the pixels of a column keep their order
+        """
+        size = self.element_byte_size
+        order = sorted(range(0, len(records), size), key=records.__getitem__)
+        return a.array("H", (records[pos + field] for pos in order for field in range(size)))
 
-            self.pixel_x_y_color.append(green)
-            local_array.append(green)
+    def _add_pixels(self, records):
+        """
+        store the pixels of records, which are sorted by column, for redrawing
+        records of columns behind the stored ones are appended, the others are merged in behind the stored
+        pixels of the same column, so later pixels are drawn over earlier ones
+        :param records: array (x, y << 8 | palette index) of the pixels, sorted by x
+        :return: None
+        """
+        if not records:
+            return
+        size = self.element_byte_size
+        stored = self.pixel_x_y_color
+        offsets = self.column_offsets
+        first_x = records[0]
+
+        if first_x >= len(offsets) - 1:
+            stored.extend(records)
+        else:
+            # the stored pixels in front of column first_x stay where they are
+            first = offsets[first_x]
+            merged = stored[:first]
+            index = first
+            new = 0
+            while index < len(stored) or new < len(records):
+                if new >= len(records) or (index < len(stored) and stored[index] <= records[new]):
+                    merged.extend(stored[index:index + size])
+                    index = index + size
+                else:
+                    merged.extend(records[new:new + size])
+                    new = new + size
+            self.pixel_x_y_color = merged
+        self._index_columns(first_x)
 
-            self.pixel_x_y_color.append(blue)
-            local_array.append(blue)
+    def _index_columns(self, first_x):
+        """
+        rebuild column_offsets from column first_x on, after the stored pixels of these columns have changed
+        :param first_x: int first changed column
+        :return: None
+        """
+        stored = self.pixel_x_y_color
+        x_pos = min(first_x, len(self.column_offsets) - 1)
+        # the arrays of CircuitPython can not shrink, the offsets in front of x_pos are copied
+        offsets = self.column_offsets[:x_pos + 1]
+        for index in range(offsets[x_pos], len(stored), self.element_byte_size):
+            while stored[index] > x_pos:
+                offsets.append(index)
+                x_pos = x_pos + 1
+        offsets.append(len(stored))
+        self.column_offsets = offsets
+
+    def _column_range(self, x_start, x_stop):
+        """
+        :param x_start: int first column
+        :param x_stop: int column behind the last one
+        :return: int, int range of pixel_x_y_color holding the pixels of the columns
+        """
+        last = len(self.column_offsets) - 1
+        x_start = min(max(x_start, 0), last)
+        x_stop = min(max(x_stop, x_start), last)
+        return self.column_offsets[x_start], self.column_offsets[x_stop]
 
-        # "put" the result onto the LED MATRIX
-        # self.put_pixels(self.pixel_xy_positions, color, intensity)
-        self.__put_pixels(local_array)
-        self.offset = next_offset
+    def stored_pixels(self, x_start, x_stop):
+        """
+        the stored pixels of a range of canvas columns, found without visiting the other columns
+        :param x_start: int first column
+        :param x_stop: int column behind the last one
+        :return: array (x, y << 8 | palette index) of the pixels
+        """
+        first, last = self._column_range(x_start, x_stop)
+        return self.pixel_x_y_color[first:last]
 
-    def __put_pixels(self, in_array):
+    def erase(self, x_start, x_stop, y_start=0, y_stop=None):
         """
-        Write pixels into display takes relative positions of the displays into account
-        :param in_array: array of bytes
+        remove the written pixels of a region and show the result, only its columns are visited
+        :param x_start: int first canvas column
+        :param x_stop: int canvas column behind the last one
+        :param y_start: int first row
+        :param y_stop: int row behind the last one, defaults to the number of rows
         :return: None
         """
-        for index in range(0, len(in_array), self.element_byte_size):
-            # set each pixel, that fits into the display
-            if in_array[index] < self.num_pixels//8:
-                self.__put_pixel(in_array[index], in_array[index + 1], in_array[index + 2], in_array[index + 3],
-                                 in_array[index + 4])
-
-        self.neopixels.show()
+        if y_stop is None:
+            y_stop = self.num_rows
+        assert 0 <= x_start <= x_stop
+        assert 0 <= y_start <= y_stop <= self.num_rows
+
+        size = self.element_byte_size
+        first, last = self._column_range(x_start, x_stop)
+        stored = self.pixel_x_y_color
+        # built anew, the arrays of CircuitPython can not shrink by slice assignment
+        kept = stored[:first]
+        for index in range(first, last, size):
+            if not y_start <= stored[index + 1] >> 8 < y_stop:
+                kept.extend(stored[index:index + size])
+        kept.extend(stored[last:])
+        self.pixel_x_y_color = kept
+        self._index_columns(x_start)
+
+        bpp = self.neopixels.bpp
+        for x_pos in range(x_start, min(x_stop, len(self.canvas) // self.column_bytes)):
+            # canvas rows are stored from bottom to top
+            top = x_pos * self.column_bytes + (self.num_rows - y_start) * bpp
+            bottom = x_pos * self.column_bytes + (self.num_rows - y_stop) * bpp
+            self.canvas[bottom:top] = self.back_column[:top - bottom]
+
+        self._render_view()
+        self._show()
+
+    def __put_pixels(self, x_start, x_stop):
+        """
+        Write the stored pixels of the columns x_start to x_stop - 1 into display, clipped to the display
+        takes relative positions of the displays into account
+        :param x_start: int first column
+        :param x_stop: int column behind the last one
+        :return: None
+        """
+        if self.view_x:
+            # the content has been scrolled, the canvas holds the new pixels already
+            self._render_view()
+            self._show()
+            return
+
+        first, last = self._column_range(x_start, min(x_stop, self.num_columns))
+        stored = self.pixel_x_y_color
+        palette = self.palette
+        for index in range(first, last, self.element_byte_size):
+            color = (stored[index + 1] & 0xFF) * 3
+            self.__put_pixel(stored[index], stored[index + 1] >> 8, palette[color], palette[color + 1],
+                             palette[color + 2])
+
+        self._show()
 
     def __put_pixel(self, x_pos, y_pos, red, green, blue):
         """
@@ -285,25 +915,26 @@ class NeoWrite:
         assert green >= 0
         assert blue <= 0xFF
         assert blue >= 0
-        assert x_pos < self.num_pixels//8  # number of total columns
+        assert x_pos < self.num_columns
         assert x_pos >= 0
-        assert y_pos <= 8
+        assert y_pos < self.num_rows
         assert y_pos >= 0
 
-        pos = self._map_led(x_pos, y_pos)
-        gc.collect()
-        if pos > self.num_pixels - 1:
-            pass
-        elif pos < 0:
-            pass
-        else:
-            self.neopixels[pos] = (red, green, blue)
+        # write into the buffer directly, avoids building a color tuple per pixel
+        bpp = self.neopixels.bpp
+        order = self.neopixels.order
+        pos = self.led_map[x_pos * self.num_rows + y_pos] * bpp
+        buf = self.neopixels.buf
+        buf[pos + order[0]] = red
+        buf[pos + order[1]] = green
+        buf[pos + order[2]] = blue
+        self.mark_dirty(pos, pos + bpp)
 
     def scroll(self, direction="LEFT", time_step=2.0):
         """
         Let the text run in top the left/right direction
         :param direction: str LEFT or RIGHT
-        :param time_step: float time in ?(not specified in neopixel document, about a second?), current max 2 Hz
+        :param time_step: float time in seconds between two steps
         :return: None
         """
         assert direction.upper() == "LEFT" or direction.upper() == "RIGHT"
@@ -311,411 +942,29 @@ class NeoWrite:
 
         step = - 1 if direction.upper() == "LEFT" else +1
 
-        furthest_right_pos = max(self.max_x, self.num_pixels//8)
-
-        # calculate new positions, safe them locally, including their corresponding color
-        if time.monotonic() >= self.time_stamp + time_step:
-            # clear unused pixel
-            for index in range(self.num_pixels):
-                self.neopixels[index] = 0
-
-            # for every position in use: x, y, red, green, blue
-            for index in range(0, len(self.pixel_x_y_color), self.element_byte_size):
-                x_pos = self.pixel_x_y_color[index]
-                new_x_pos = (x_pos + step) % furthest_right_pos
-                self.pixel_x_y_color[index] = new_x_pos
-
-                if new_x_pos >= self.num_pixels // 8:
-                    continue
-                else:
-                    # put used pixel
-                    red = index + 2
-                    green = index + 3
-                    blue = index + 4
-
-                    pos = self._map_led(new_x_pos, self.pixel_x_y_color[index + 1])
-                    self.neopixels[pos] = (self.pixel_x_y_color[red], self.pixel_x_y_color[green],
-                                           self.pixel_x_y_color[blue])
+        now = time.monotonic()
+        if now >= self.time_stamp + time_step:
+            self.time_stamp = now
+            self.scroll_by(step)
 
-            self.neopixels.show()
+    def scroll_by(self, step):
+        """
+        move the text by step columns and show it, without waiting for a time step
+        :param step: int columns, negative to the left, positive to the right
+        :return: None
+        """
+        # the content stays in the canvas, only the viewport moves against the scroll direction
+        furthest_right_pos = max(self.max_x, self.num_columns)
+        self.view_x = (self.view_x - step) % furthest_right_pos
+        self._render_view()
+        self._show()
 
     def deinit(self):
+        self.stop_recording()
         self.neopixels.deinit()
         gc.collect()
 
 
-def _get_pixel(character, in_offset):
-    """
-    get the LED position for a given sign/character
-    :type character: String to write (extract each character and search for the resulting LED positions
-    :type in_offset: int current x-position offset
-    :return: byte array
-    """
-    assert len(character) == 1
-    assert ord(character) < 128  # if is ascii
-
-    if character.isalpha() and character.isupper():
-        r_tuple, r_offset = _get_pixel_from_capitals(character)
-    elif character.isalpha() and character.islower():
-        r_tuple, r_offset = _get_pixel_from_minuscules(character)
-    elif character.isdigit():
-        r_tuple, r_offset = _get_pixel_from_dec(character)
-    elif character in "/ ?.!:;, ":
-        r_tuple, r_offset = _get_pixel_from_special(character)
-    else:
-        r_tuple = a.array("B", ())
-        r_offset = 0
-    return r_tuple, in_offset + r_offset
-
-
-def _get_pixel_from_capitals(letter):
-    """
-    get the LED position for a given sign/character
-    :type letter: string
-    :return: byte array of int
-    """
-    if letter == "A":
-        offset = 8
-        r_tuple = a.array("B", (0, 6, 1, 4, 1, 5, 1, 6, 2, 1,
-                                2, 2, 2, 3, 3, 0, 3, 3, 4, 0,
-                                4, 3, 5, 1, 5, 2, 5, 3, 5, 4, 5, 5, 5, 6, 6, 6))
-    elif letter == "B":
-        offset = 6
-        r_tuple = a.array("B", (0, 0, 0, 1, 0, 2, 0, 3, 0, 4,
-                                0, 5, 0, 6, 1, 0, 1, 3, 1, 6, 2, 0, 2, 3, 2, 6, 3, 0,
-                                3, 3, 3, 6, 4, 1, 4, 2, 4, 4, 4, 5))
-    elif letter == "C":
-        offset = 6
-        r_tuple = a.array("B", (0, 1, 0, 2, 0, 3, 0, 4, 0, 5,
-                                1, 0, 1, 1, 1, 5, 1, 6, 2, 0, 2, 6, 3, 0, 3, 6, 4, 1, 4, 5))
-    elif letter == "D":
-        offset = 6
-        r_tuple = a.array("B", (0, 0, 0, 1, 0, 2, 0, 3, 0, 4,
-                                0, 5, 0, 6, 1, 0, 1, 6, 2, 0,
-                                2, 6, 3, 1, 3, 5, 4, 2, 4, 3, 4, 4))
-    elif letter == "E":
-        offset = 5
-        r_tuple = a.array("B", (0, 0, 0, 1, 0, 2, 0, 3, 0, 4,
-                                0, 5, 0, 6, 1, 0, 1, 3, 1, 6, 2, 0, 2, 3, 2, 6, 3, 0, 3, 6))
-    elif letter == "F":
-        offset = 5
-        r_tuple = a.array("B", (0, 0, 0, 1, 0, 2, 0, 3, 0, 4,
-                                0, 5, 0, 6, 1, 0, 1, 3, 2, 0, 2, 3, 3, 0))
-    elif letter == "G":
-        offset = 6
-        r_tuple = a.array("B", (0, 1, 0, 2, 0, 3, 0, 4, 0, 5,
-                                1, 0, 1, 6, 2, 0, 2, 4, 2, 6,
-                                3, 0, 3, 4, 3, 5, 4, 1, 4, 2,
-                                4, 4, 4, 5, 4, 6))
-    elif letter == "H":
-        offset = 6
-        r_tuple = a.array("B", (0, 0, 0, 1, 0, 2, 0, 3, 0, 4,
-                                0, 5, 0, 6, 1, 3, 2, 3, 3, 3,
-                                4, 0, 4, 1, 4, 2, 4, 3, 4, 4, 4, 5, 4, 6))
-    elif letter == "I":
-        offset = 2
-        r_tuple = a.array("B", (0, 0, 0, 1, 0, 2, 0, 3, 0, 4, 0, 5, 0, 6))
-    elif letter == "J":
-        offset = 5
-        r_tuple = a.array("B", (0, 0, 0, 1, 0, 5, 1, 0, 1, 6,
-                                2, 0, 2, 6, 3, 0, 3, 1, 3, 2, 3, 3, 3, 4, 3, 5))
-    elif letter == "K":
-        offset = 5
-        r_tuple = a.array("B", (0, 0, 0, 1, 0, 2, 0, 3, 0, 4,
-                                0, 5, 0, 6, 1, 3, 2, 2, 2, 4, 3, 0, 3, 1, 3, 5, 3, 6))
-    elif letter == "L":
-        offset = 6
-        r_tuple = a.array("B", (0, 0, 0, 1, 0, 2, 0, 3, 0, 4,
-                                0, 5, 0, 6, 1, 6, 2, 6, 3, 6))
-    elif letter == "M":
-        offset = 6
-        r_tuple = a.array("B", (0, 0, 0, 1, 0, 2, 0, 3, 0, 4,
-                                0, 5, 0, 6, 1, 1, 1, 2, 2, 3,
-                                3, 1, 3, 2, 4, 0, 4, 1, 4, 2,
-                                4, 3, 4, 4, 4, 5, 4, 6))
-    elif letter == "N":
-        offset = 5
-        r_tuple = a.array("B", (0, 0, 0, 1, 0, 2, 0, 3, 0, 4,
-                                0, 5, 0, 6, 1, 1, 1, 2, 2, 3,
-                                2, 4, 3, 0, 3, 1, 3, 2, 3, 3, 3, 4, 3, 5, 3, 6))
-    elif letter == "O":
-        offset = 6
-        r_tuple = a.array("B", (0, 1, 0, 2, 0, 3, 0, 4, 0, 5,
-                                1, 0, 1, 1, 1, 5, 1, 6, 2, 0,
-                                2, 6, 3, 0, 3, 1, 3, 5, 3, 6,
-                                4, 1, 4, 2, 4, 3, 4, 4, 4, 5))
-    elif letter == "P":
-        offset = 6
-        r_tuple = a.array("B", (0, 0, 0, 1, 0, 2, 0, 3, 0, 4,
-                                0, 5, 0, 6, 1, 0, 1, 3, 2, 0,
-                                2, 3, 3, 0, 3, 3, 4, 1, 4, 2))
-    elif letter == "Q":
-        offset = 6
-        r_tuple = a.array("B", (0, 1, 0, 2, 0, 3, 0, 4, 0, 5,
-                                1, 0, 1, 1, 1, 5, 1, 6, 2, 0,
-                                2, 4, 2, 6, 3, 0, 3, 1, 3, 5,
-                                4, 1, 4, 2, 4, 3, 4, 4, 4, 6))
-    elif letter == "R":
-        offset = 5
-        r_tuple = a.array("B", (0, 0, 0, 1, 0, 2, 0, 3, 0, 4,
-                                0, 5, 0, 6, 1, 0, 1, 3, 2, 0,
-                                2, 3, 2, 4, 3, 1, 3, 2, 3, 5, 3, 6))
-    elif letter == "S":
-        offset = 6
-        r_tuple = a.array("B", (0, 1, 0, 2, 0, 5, 1, 0, 1, 2,
-                                1, 6, 2, 0, 2, 3, 2, 6, 3, 0,
-                                3, 4, 3, 6, 4, 1, 4, 4, 4, 5))
-    elif letter == "T":
-        offset = 6
-        r_tuple = a.array("B", (0, 0, 1, 0, 2, 0, 2, 1, 2, 2,
-                                2, 3, 2, 4, 2, 5, 2, 6, 3, 0, 4, 0))
-    elif letter == "U":
-        offset = 5
-        r_tuple = a.array("B", (0, 0, 0, 1, 0, 2, 0, 3, 0, 4,
-                                0, 5, 1, 5, 1, 6, 2, 5, 3, 0,
-                                3, 1, 3, 2, 3, 3, 3, 4, 3, 5,
-                                3, 6))
-    elif letter == "V":
-        offset = 6
-        r_tuple = a.array("B", (0, 0, 1, 0, 1, 1, 1, 2, 1, 3,
-                                1, 4, 1, 5, 2, 6, 3, 0, 3, 1,
-                                3, 2, 3, 3, 3, 4, 3, 5, 4, 0))
-    elif letter == "W":
-        offset = 6
-        r_tuple = a.array("B", (0, 0, 0, 1, 0, 2, 0, 3, 0, 4,
-                                1, 4, 1, 5, 1, 6, 2, 0, 2, 1,
-                                2, 3, 2, 4, 3, 4, 3, 5, 3, 6,
-                                4, 0, 4, 1, 4, 2, 4, 3, 4, 4))
-    elif letter == "X":
-        offset = 5
-        r_tuple = a.array("B", (0, 0, 0, 6, 1, 1, 1, 2, 1, 4,
-                                1, 5, 1, 0, 2, 3, 3, 1, 3, 2,
-                                3, 4, 3, 5, 4, 0, 4, 5, 4, 6))
-    elif letter == "Y":
-        offset = 5
-        r_tuple = a.array("B", (0, 0, 1, 1, 2, 2, 2, 3, 2, 4,
-                                2, 5, 2, 6, 3, 0, 3, 1))
-    elif letter == "Z":
-        offset = 6
-        r_tuple = a.array("B", (0, 0, 0, 5, 0, 6, 1, 0, 1, 3,
-                                1, 4, 2, 0, 2, 2, 2, 3, 2, 6,
-                                3, 0, 3, 1, 3, 3, 3, 6, 4, 0, 4, 1, 4, 6))
-    else:
-        r_tuple = a.array("B", ())
-        offset = 0
-    return r_tuple, offset
-
-
-def _get_pixel_from_dec(number):
-    """
-    get the LED positions for the given number
-    :type number: string of the number 0-9
-    :return: byte array
-    """
-    if number == "1":
-        offset = 5
-        r_tuple = a.array("B", (0, 2, 1, 1, 2, 0, 2, 1, 3, 0,
-                                3, 1, 3, 2, 3, 3, 3, 4, 3, 5, 3, 6))
-    elif number == "2":
-        offset = 5
-        r_tuple = a.array("B", (0, 1, 0, 6, 1, 0, 1, 4,
-                                1, 5, 1, 6, 2, 0, 2, 3,
-                                2, 6, 3, 1, 3, 2, 3, 4, 3, 6))
-    elif number == "3":
-        offset = 5
-        r_tuple = a.array("B", (0, 0, 0, 3, 0, 6, 1, 0, 1, 3,
-                                1, 6, 2, 0, 2, 2, 2, 3, 2, 6,
-                                3, 1, 3, 2, 3, 4, 3, 5))
-    elif number == "4":
-        offset = 5
-        r_tuple = a.array("B", (0, 0, 0, 1, 0, 2, 0, 3, 1, 4,
-                                2, 4, 3, 3, 3, 4, 3, 5, 3, 6))
-    elif number == "5":
-        offset = 5
-        r_tuple = a.array("B", (0, 0, 0, 1, 0, 2, 0, 5,
-                                1, 0, 1, 3, 1, 6, 2, 0,
-                                2, 3, 2, 6, 3, 0,
-                                3, 4, 3, 5))
-    elif number == "6":
-        offset = 5
-        r_tuple = a.array("B", (0, 0, 0, 1, 0, 2, 0, 3, 0, 4,
-                                0, 5, 0, 6, 1, 0, 1, 3, 1, 6,
-                                2, 0, 2, 3, 2, 6, 3, 0, 3, 4, 3, 5))
-    elif number == "7":
-        offset = 5
-        r_tuple = a.array("B", (0, 0, 0, 3, 0, 5, 0, 6, 1, 0,
-                                1, 3, 1, 4, 2, 0, 2, 1, 2, 2,
-                                2, 3, 3, 0, 3, 1, 3, 3))
-    elif number == "8":
-        offset = 5
-        r_tuple = a.array("B", (0, 1, 0, 2, 0, 4, 0, 5, 1, 0,
-                                1, 3, 1, 6, 2, 0, 2, 3, 2, 6,
-                                3, 1, 3, 2, 3, 4, 3, 5))
-    elif number == "9":
-        offset = 5
-        r_tuple = a.array("B", (0, 1, 0, 2, 0, 3, 0, 5, 0, 6,
-                                1, 0, 1, 3, 1, 6, 2, 0, 2, 3,
-                                2, 6, 3, 1, 3, 2, 3, 3, 3, 4,
-                                3, 5))
-    elif number == "0":
-        offset = 5
-        r_tuple = a.array("B", (0, 0, 0, 1, 0, 2, 0, 3, 0, 4,
-                                0, 5, 0, 6, 1, 0, 1, 6, 2, 0,
-                                2, 6, 3, 0, 3, 1, 3, 2, 3, 3,
-                                3, 4, 3, 5, 3, 6))
-    else:
-        r_tuple = a.array("B", ())
-        offset = 0
-    return r_tuple, offset
-
-
-def _get_pixel_from_special(character):
-    """
-    get the LED position for a given sign/character
-    :type character: string with one special character
-    :return: byte array
-    """
-    if character == "/":
-        offset = 4
-        r_tuple = a.array("B", (0, 5, 0, 6, 1, 2, 1, 3, 1, 4,
-                                1, 5, 2, 0, 2, 1, 2, 2))
-    # elif character == '\\':
-    #     offset = 4
-    #    r_tuple = a.array("B", (0, 0, 0, 1, 0, 6, 1, 1, 1, 2,
-    #                            1, 3, 2, 3, 2, 4, 2, 4, 3, 5, 3, 6))
-    elif character == "?":
-        offset = 4
-        r_tuple = a.array("B", (0, 0, 0, 1, 0, 3, 0, 4, 1, 0,
-                                1, 2, 1, 4, 1, 6, 2, 0, 2, 1, 2, 4))
-    elif character == ".":
-        offset = 2
-        r_tuple = a.array("B", (0, 6))
-    elif character == "!":
-        offset = 2
-        r_tuple = a.array("B", (0, 0, 0, 1, 0, 2, 0, 3, 0, 4, 0, 6))
-    elif character == ":":
-        offset = 2
-        r_tuple = a.array("B", (0, 3, 0, 5))
-    elif character == ",":
-        offset = 2
-        r_tuple = a.array("B", (0, 6, 0, 7, 1, 5, 0, 6))
-    elif character == ";":
-        offset = 2
-        r_tuple = a.array("B", (0, 3, 0, 5, 0, 6, 0, 7))
-    elif character == ",":
-        offset = 2
-        r_tuple = a.array("B", (0, 5, 0, 6, 0, 7))
-    elif character == " ":
-        offset = 1
-        r_tuple = a.array("B", ())
-    else:
-        r_tuple = a.array("B", ())
-        offset = 0
-    return r_tuple, offset
-
-
-def _get_pixel_from_minuscules(letter):
-    """
-        get the LED position for a given sign/character
-        :type letter: string of one small cap. letter
-        :return: byte array
-        """
-    if letter == "a":
-        offset = 6
-        r_tuple = a.array("B", (0, 4, 0, 5, 1, 3, 1, 6, 2, 3,
-                                2, 6, 3, 4, 3, 5, 4, 3, 4, 4, 4, 5, 4, 6))
-    elif letter == "b":
-        offset = 5
-        r_tuple = a.array("B", (0, 0, 0, 1, 0, 2, 0, 3, 0, 4,
-                                0, 5, 0, 6, 1, 3, 1, 6, 2, 3,
-                                2, 6, 3, 4, 3, 5))
-    elif letter == "c":
-        offset = 4
-        r_tuple = a.array("B", (0, 4, 0, 5, 1, 3, 1, 6, 2, 3, 2, 6))
-    elif letter == "d":
-        offset = 5
-        r_tuple = a.array("B", (0, 4, 0, 5, 1, 3, 1, 6, 3, 0,
-                                3, 1, 3, 2, 3, 3, 3, 4, 3, 5, 3, 6))
-    elif letter == "e":
-        offset = 5
-        r_tuple = a.array("B", (0, 3, 0, 4, 0, 5, 1, 2, 1, 4,
-                                1, 6, 2, 2, 2, 4, 2, 6, 3, 3, 3, 4, 3, 6))
-    elif letter == "f":
-        offset = 5
-        r_tuple = a.array("B", (0, 3, 1, 0, 1, 1, 1, 2, 1, 3,
-                                1, 4, 1, 5, 1, 6, 2, 0, 2, 3, 3, 0))
-    elif letter == "g":
-        offset = 4
-        r_tuple = a.array("B", (0, 3, 0, 4, 0, 5, 0, 7, 1, 3,
-                                1, 5, 1, 7, 2, 3, 2, 4, 2, 5,
-                                2, 6, 2, 7))
-    elif letter == "h":
-        offset = 5
-        r_tuple = a.array("B", (0, 0, 0, 1, 0, 2, 0, 3, 0, 4,
-                                0, 5, 0, 6, 1, 3, 2, 3, 3, 3,
-                                3, 4, 3, 5, 3, 6))
-    elif letter == "i":
-        offset = 2
-        r_tuple = a.array("B", (0, 1, 0, 3, 0, 4, 0, 5, 0, 6))
-    elif letter == "j":
-        offset = 3
-        r_tuple = a.array("B", (0, 7, 1, 1, 1, 3, 1, 4, 1, 5, 1, 6, 1, 7))
-    elif letter == "k":
-        offset = 4
-        r_tuple = a.array("B", (0, 0, 0, 1, 0, 2, 0, 3, 0, 4,
-                                0, 5, 0, 6, 1, 5, 2, 3, 2, 4, 2, 6))
-    elif letter == "l":
-        offset = 4
-        r_tuple = a.array("B", (0, 0, 0, 1, 0, 2, 0, 3, 0, 4, 0, 5, 1, 6, 2, 6))
-    elif letter == "m":
-        offset = 6
-        r_tuple = a.array("B", (0, 3, 0, 4, 0, 5, 0, 6, 1, 4, 2,
-                                4, 2, 5, 2, 6, 3, 4, 4, 4, 4, 5, 4, 6))
-    elif letter == "n":
-        offset = 4
-        r_tuple = a.array("B", (0, 3, 0, 4, 0, 5, 0, 6, 1, 4, 2, 4, 2, 5, 2, 6))
-    elif letter == "o":
-        offset = 5
-        r_tuple = a.array("B", (0, 4, 0, 5, 0, 6, 1, 3, 1, 6, 2, 3, 2, 6, 3, 4, 4, 5))
-    elif letter == "p":
-        offset = 5
-        r_tuple = a.array("B", (0, 3, 0, 4, 0, 5, 0, 6, 1, 3, 1, 5, 2, 3, 2, 5, 3, 4))
-    elif letter == "q":
-        offset = 6
-        r_tuple = a.array("B", (0, 4, 1, 3, 1, 5, 2, 3, 2, 5, 3, 3, 3, 4, 3, 5, 3, 6, 3, 7))
-    elif letter == "r":
-        offset = 4
-        r_tuple = a.array("B", (0, 3, 0, 4, 0, 5, 0, 6, 1, 4, 2, 3))
-    elif letter == "s":
-        offset = 4
-        r_tuple = a.array("B", (0, 3, 0, 4, 0, 6, 1, 3, 1, 4, 1, 5, 2, 3, 2, 5, 2, 6))
-    elif letter == "t":
-        offset = 4
-        r_tuple = a.array("B", (0, 2, 1, 0, 1, 1, 1, 2, 1, 3, 1, 4, 1, 5, 1, 6, 2, 2))
-    elif letter == "u":
-        offset = 5
-        r_tuple = a.array("B", (0, 3, 0, 4, 0, 5, 1, 6, 2, 5, 3, 3, 3, 4, 3, 5, 3, 6))
-    elif letter == "v":
-        offset = 4
-        r_tuple = a.array("B", (0, 3, 0, 4, 1, 5, 1, 6, 2, 3, 2, 4))
-    elif letter == "w":
-        offset = 6
-        r_tuple = a.array("B", (0, 3, 0, 4, 1, 5, 1, 6, 2, 4, 3, 5, 3, 6, 4, 3, 4, 4))
-    elif letter == "x":
-        offset = 4
-        r_tuple = a.array("B", (0, 3, 0, 4, 0, 6, 1, 5, 2, 3, 2, 4, 2, 6))
-    elif letter == "y":
-        offset = 4
-        r_tuple = a.array("B", (0, 3, 0, 4, 0, 5, 0, 7, 1, 5, 1, 7, 2, 3, 2, 4, 2, 5, 2, 6, 2, 7))
-    elif letter == "z":
-        offset = 5
-        r_tuple = a.array("B", (0, 3, 0, 6, 1, 3, 1, 5, 1, 6, 2, 3, 2, 4, 2, 6, 3, 3, 3, 6))
-    else:
-        r_tuple = a.array("B", ())
-        offset = 0
-    return r_tuple, offset
-
-
 def run_test():
     neo = NeoWrite(4, b.D4)
     neo.write("ABC")
@@ -739,6 +988,97 @@ def run_test():
     print("Test passed!")
 
 
+def check_column_index(neo):
+    """
+    assert that the stored pixels are sorted by column and column_offsets points at the pixels of each column
+    :type neo: NeoWrite
+    :return: None
+    """
+    stored = neo.pixel_x_y_color
+    offsets = neo.column_offsets
+    assert offsets[0] == 0
+    assert offsets[-1] == len(stored)
+    for x_pos in range(len(offsets) - 1):
+        assert offsets[x_pos] <= offsets[x_pos + 1]
+        for index in range(offsets[x_pos], offsets[x_pos + 1], neo.element_byte_size):
+            assert stored[index] == x_pos, "pixel of column " + str(stored[index]) + " in column " + str(x_pos)
+
+
+def check_palette():
+    """
+    behavior checks of the palette: recolor and merged palette entries
+    :return: None
+    """
+    # entries of the same color merge, no pixel keeps its old color
+    neo = NeoWrite(4, 0)
+    neo.write("A", color=Color(COLORS.RED))
+    neo.write("B", color=Color(COLORS.GREEN))
+    neo.recolor(Color(COLORS.RED), Color(COLORS.GREEN))
+    neo.recolor(Color(COLORS.GREEN), Color(COLORS.BLUE))
+    blue = Color.intensity(Color(COLORS.BLUE), 5)
+    for index in range(0, len(neo.pixel_x_y_color), neo.element_byte_size):
+        color = (neo.pixel_x_y_color[index + 1] & 0xFF) * 3
+        assert tuple(neo.palette[color:color + 3]) == blue
+
+    # a pixel written over keeps its later color, when the earlier color changes
+    neo = NeoWrite(4, 0)
+    neo.write_raw(a.array("B", (0, 0)), 0, Color(COLORS.RED), 100)
+    neo.write_raw(a.array("B", (0, 0)), 0, Color(COLORS.BLUE), 100)
+    neo.recolor(Color(COLORS.RED), Color(COLORS.GREEN), 100)
+    assert neo.neopixels[neo.led_map[0]] == (0, 0, 255)
+    neo.scroll_by(-1)
+    neo.scroll_by(1)
+    assert neo.neopixels[neo.led_map[0]] == (0, 0, 255)
+
+
+def check_reset():
+    """
+    behavior checks of reset: the written pixels are dimmed again and the background is kept
+    :return: None
+    """
+    # the background of reset survives scrolling
+    for step in (0, -2):
+        neo = NeoWrite(4, 0)
+        neo.write("AB")
+        neo.scroll_by(step)
+        neo.reset(back_color=Color(COLORS.RED), intensity=10)
+        assert neo.neopixels[neo.led_map[0]] == (0x19, 0, 0)
+        # the text is dimmed again from white at 5 % to 10 %
+        assert set(neo.neopixels[:]) == {(0x19, 0, 0), (0x19, 0x19, 0x19)}
+        neo.erase(0, neo.max_x)
+        neo.scroll_by(-1)
+        assert set(neo.neopixels[:]) == {(0x19, 0, 0)}
+
+
+def run_checks():
+    """
+    behavior checks of the stored pixels, the palette and reset
+    :return: None
+    """
+    # glyphs wider than their advance reach into the next glyph
+    wide_font = f.Font(b"\x01\x02\x04", a.array("H", (0,)), b"\x03", b"\x01", 65)
+    neo = NeoWrite(4, b.D4)
+    neo.write("AAA", font=wide_font)
+    check_column_index(neo)
+    assert list(neo.stored_pixels(2, 3)[0::2]) == [2, 2, 2]
+    neo.write_raw(a.array("B", (9, 1, 0, 7, 9, 2)), 0)
+    neo.write("AB")
+    check_column_index(neo)
+    neo.erase(2, 3)
+    check_column_index(neo)
+    assert not neo.stored_pixels(2, 3)
+    neo.erase(0, 40, 0, 4)
+    check_column_index(neo)
+    assert all(y_color >> 8 >= 4 for y_color in neo.pixel_x_y_color[1::2])
+
+    check_palette()
+
+    check_reset()
+
+    print("Checks passed!")
+
+
 if __name__ == "__main__":
 
     run_test()
+    run_checks()
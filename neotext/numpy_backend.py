@@ -0,0 +1,268 @@
+"""
+NumPy framebuffer backend of NeoWrite, for running neotext under CPython
+the content is kept in a (rows, columns) array of palette indices, so rendering, scrolling, dimming and
+the conversion into the wire order of the neopixels are single vectorized operations
+author: Sebastian Heiden
+"""
+
+import array as a
+
+import numpy as np
+
+import font as f
+from neotext import Color, COLORS, NeoWrite
+
+
+class NumpyNeoWrite(NeoWrite):
+    """
+    NeoWrite keeping its content in a NumPy array of palette indices, 0 for unlit pixels and
+    index + 1 for pixels of palette entry index, the colors are looked up while showing the frame
+    the array may be much wider than the matrices, its width grows with the written content,
+    scrolling moves the viewport view_x over it
+    """
+
+    def __init__(self, num_tiles, pin, back_color=Color(COLORS.BLACK), intensity=5, orientation="ZIGZAG",
+                 gc_every=1, tile_rows=1, tile_layout=None, profile=False):
+        """
+        :type num_tiles: int number of neopixel matrices in each row of the grid
+        :type pin: pin
+        :type back_color: Color
+        :type intensity: int
+        :type gc_every: int run the garbage collector after every gc_every shown frames, 0 never runs it
+        :type tile_rows: int number of rows of matrices in the grid
+        :type tile_layout: sequence of (tile_x, tile_y) positions of the matrices in the order of the chain
+        :type profile: bool measure the show and gc stages, see NeoWrite.stats()
+        """
+        self.indices = None
+        self.brightness = 100
+        super().__init__(num_tiles, pin, back_color, intensity, orientation, cache_bytes=0, gc_every=gc_every,
+                         tile_rows=tile_rows, tile_layout=tile_layout, profile=profile)
+
+        # byte position in the neopixel buffer of every (y, x, color) element of the visible frame
+        led_index = np.array(self.led_map, np.intp).reshape(self.num_columns, self.num_rows).T
+        order = np.array(self.neopixels.order[:3], np.intp)
+        self.wire_index = led_index[:, :, np.newaxis] * self.neopixels.bpp + order
+
+    def _grow(self, width):
+        """
+        widen the frame to at least width columns
+        :type width: int number of columns
+        :return: None
+        """
+        if width > self.indices.shape[1]:
+            self.indices = np.concatenate(
+                (self.indices, np.zeros((self.num_rows, width - self.indices.shape[1]), np.uint16)), axis=1)
+
+    def clear(self, in_num=0, back_color=Color(COLORS.BLACK), intensity=0):
+        """
+        clear to background color back_color with the max. intensity intensity
+        and resetting the starting in_num for next write
+        :type in_num: int number of x-position offset
+        :type back_color: Color color to set
+        :type intensity: int max. intensity of each led
+        :return: None
+        """
+        assert in_num >= 0
+        assert in_num < self.num_columns
+        assert intensity >= 0
+        assert intensity <= 100
+
+        self.offset = in_num
+        self.max_x = self.offset
+        self.view_x = 0
+        self.indices = np.zeros((self.num_rows, self.num_columns), np.uint16)
+        self._clear_palette()
+        self.back = Color.intensity(back_color, intensity)
+        if hasattr(self, "wire_index"):
+            self.show()
+
+    def reset(self, in_num=0, back_color=Color(COLORS.BLACK), foreground_color=Color(COLORS.WHITE), intensity=5):
+        """
+        dim everything written to intensity with back_color as background, see NeoWrite.reset
+        only the palette changes, the indices stay as they are
+        :return: None
+        """
+        assert in_num >= 0
+        assert in_num < self.num_columns
+        assert intensity >= 0
+        assert intensity <= 100
+
+        self.offset = in_num
+        self._dim_palette(intensity)
+        self.back = Color.intensity(back_color, intensity)
+        self.show()
+
+    def _remap_palette(self, index, other):
+        self.indices[self.indices == index + 1] = other + 1
+
+    def _repaint(self, index=None):
+        # the colors are looked up in the palette while rendering, e.g. after recolor()
+        return
+
+    def stored_pixels(self, x_start, x_stop):
+        """
+        the written pixels of a range of columns, see NeoWrite.stored_pixels
+        :param x_start: int first column
+        :param x_stop: int column behind the last one
+        :return: array (x, y << 8 | palette index) of the pixels, sorted by column
+        """
+        x_start = max(x_start, 0)
+        x_pos, y_pos = np.nonzero(self.indices[:, x_start:max(x_stop, x_start)].T)
+        records = np.empty(2 * len(x_pos), np.uint16)
+        records[0::2] = x_pos + x_start
+        records[1::2] = y_pos << 8 | self.indices[y_pos, x_pos + x_start] - 1
+        return a.array("H", records.tolist())
+
+    def erase(self, x_start, x_stop, y_start=0, y_stop=None):
+        """
+        remove the written pixels of a region and show the result, see NeoWrite.erase
+        :return: None
+        """
+        if y_stop is None:
+            y_stop = self.num_rows
+        assert 0 <= x_start <= x_stop
+        assert 0 <= y_start <= y_stop <= self.num_rows
+
+        self.indices[y_start:y_stop, x_start:x_stop] = 0
+        self.show()
+
+    def write(self, text, color=Color(COLORS.WHITE), intensity=5, font=f.DEFAULT_FONT, line=0):
+        """
+        Writes the given text to the frame with:
+        :type text: string text to be written
+        :type color: Color color of the LEDs
+        :type intensity: int max. intensity for each LED
+        :type font: Font bitmap font of the text
+        :type line: int row of matrices to write into, 0 is the top row
+        :return: None
+        """
+        assert intensity >= 0
+        assert intensity <= 100
+        assert 0 <= line < self.num_rows // 8
+
+        # collect the column bitmasks of the whole text, then expand them all at once
+        masks = bytearray()
+        x_offset = 0
+        for letter in text:
+            code = font.index(letter)
+            if code < 0:
+                continue
+            start = font.starts[code]
+            width = font.widths[code]
+            if len(masks) < x_offset + width:
+                masks.extend(bytes(x_offset + width - len(masks)))
+            for column in range(width):
+                masks[x_offset + column] |= font.columns[start + column]
+            x_offset = x_offset + font.advances[code]
+
+        masks = masks.rstrip(b"\x00")
+        if masks:
+            lit = np.unpackbits(np.frombuffer(bytes(masks), np.uint8)[np.newaxis, :], axis=0,
+                                bitorder="little").astype(bool)
+            self.max_x = max(self.max_x, self.offset + len(masks) + 1)
+            self._grow(self.max_x)
+            self.indices[line * 8:line * 8 + 8, self.offset:self.offset + len(masks)][lit] = \
+                self._palette_index(color, intensity) + 1
+
+        self.offset = self.offset + x_offset
+        self.show()
+
+    def write_raw(self, raw_position_list, next_offset, color=Color(COLORS.WHITE), intensity=5):
+        """
+        Write the raw (x,y)-Positions into the frame
+        :type raw_position_list: array (of Byte)
+        :type next_offset: int, offset for placement of next letter
+        :type color: Color color of the LEDs
+        :type intensity: int max. intensity of each LED
+        :return: None
+        """
+        assert intensity >= 0
+        assert intensity <= 100
+
+        positions = np.array(raw_position_list, np.intp)
+        if len(positions):
+            x_pos = positions[0::2] + self.offset
+            y_pos = positions[1::2]
+            self.max_x = max(self.max_x, int(x_pos.max()) + 2)
+            self._grow(self.max_x)
+            self.indices[y_pos, x_pos] = self._palette_index(color, intensity) + 1
+
+        self.offset = next_offset
+        self.show()
+
+    def scroll_by(self, step):
+        """
+        move the text by step columns and show it
+        :param step: int columns, negative to the left, positive to the right
+        :return: None
+        """
+        self.view_x = (self.view_x - step) % max(self.max_x, self.num_columns)
+        self.show()
+
+    def show(self):
+        """
+        show the visible part of the frame
+        :return: None
+        """
+        self._render_view()
+        self._show()
+
+    def _render_view(self):
+        """
+        copy the visible columns, starting with column view_x, dimmed to brightness percent into the neopixel
+        buffer
+        :return: None
+        """
+        width = max(self.max_x, self.num_columns)
+        self._grow(width)
+        columns = (self.view_x + np.arange(self.num_columns)) % width
+        colors = np.empty((len(self.palette_source) + 1, 3), np.uint8)
+        colors[0] = self.back
+        colors[1:] = np.frombuffer(self.palette, np.uint8).reshape(-1, 3)
+        visible = colors[self.indices[:, columns]]
+        if self.brightness < 100:
+            visible = (visible.astype(np.uint16) * self.brightness // 100).astype(np.uint8)
+        # buf is swapped by every show(), so it is wrapped again each time
+        np.frombuffer(self.neopixels.buf, np.uint8)[self.wire_index] = visible
+        self.mark_dirty()
+
+
+def run_checks():
+    """
+    behavior checks: NumpyNeoWrite shows the same frames as NeoWrite
+    :return: None
+    """
+    import array
+
+    heart = array.array("B", (0, 3, 0, 4, 1, 2, 1, 3, 1, 4, 1, 5, 2, 3, 2, 4, 6, 4))
+    steps = (
+        lambda neo: neo.write("Hello 42", color=Color(COLORS.ORANGE), intensity=30),
+        lambda neo: neo.write_raw(heart, 8, Color(COLORS.RED)),
+        lambda neo: neo.write("ab", line=1),
+        lambda neo: neo.scroll_by(-5),
+        lambda neo: neo.write("xyz", color=Color(COLORS.BLUE)),
+        lambda neo: neo.scroll_by(3),
+        lambda neo: neo.recolor(Color(COLORS.RED), Color(COLORS.GREEN)),
+        lambda neo: neo.erase(2, 9, 0, 5),
+        lambda neo: neo.reset(back_color=Color(COLORS.CYAN), intensity=10),
+        lambda neo: neo.scroll_by(-20),
+    )
+    for orientation in ("ZIGZAG", "LINE"):
+        expected = NeoWrite(2, 0, orientation=orientation, tile_rows=2)
+        numpy_neo = NumpyNeoWrite(2, 0, orientation=orientation, tile_rows=2)
+        for index, step in enumerate(steps):
+            step(expected)
+            step(numpy_neo)
+            assert numpy_neo.neopixels.buf == expected.neopixels.buf, (orientation, index)
+        # NeoWrite keeps overwritten pixels as well, the positions are the same
+        positions = []
+        for neo in (expected, numpy_neo):
+            stored = neo.stored_pixels(0, neo.max_x)
+            positions.append(set(zip(stored[0::2], (y_color >> 8 for y_color in stored[1::2]))))
+        assert positions[0] == positions[1]
+    print("NumPy checks passed!")
+
+
+if __name__ == "__main__":
+
+    run_checks()
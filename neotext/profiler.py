@@ -0,0 +1,82 @@
+"""
+timing of the stages of neotext: counters and latency histograms per stage
+the profiler wraps the measured functions, without it nothing is measured and nothing is paid
+author: Sebastian Heiden
+"""
+
+import time
+
+
+class Profiler:
+    """
+    collects the number of calls, the total and max. duration and a histogram of the durations of each stage
+    bucket i of a histogram counts the calls, which took less than 2 ** i microseconds,
+    the last bucket all slower ones
+    """
+
+    def __init__(self, num_buckets=16):
+        """
+        :type num_buckets: int number of histogram buckets
+        """
+        assert num_buckets > 0
+
+        self.num_buckets = num_buckets
+        self.reset()
+
+    def reset(self):
+        """
+        forget all measurements
+        :return: None
+        """
+        self._stages = {}
+
+    def add(self, stage, duration_ns):
+        """
+        count one call of stage
+        :type stage: str name of the stage
+        :type duration_ns: int duration of the call in nanoseconds
+        :return: None
+        """
+        entry = self._stages.get(stage)
+        if entry is None:
+            entry = [0, 0, 0, [0] * self.num_buckets]
+            self._stages[stage] = entry
+        entry[0] = entry[0] + 1
+        entry[1] = entry[1] + duration_ns
+        if duration_ns > entry[2]:
+            entry[2] = duration_ns
+
+        bucket = 0
+        duration_us = duration_ns // 1000
+        while duration_us >= (1 << bucket) and bucket < self.num_buckets - 1:
+            bucket = bucket + 1
+        entry[3][bucket] = entry[3][bucket] + 1
+
+    def wrap(self, stage, function):
+        """
+        :type stage: str name of the stage
+        :param function: callable to measure
+        :return: callable, which calls function and adds its duration to stage
+        """
+        def measured(*args, **kwargs):
+            start = time.monotonic_ns()
+            result = function(*args, **kwargs)
+            self.add(stage, time.monotonic_ns() - start)
+            return result
+
+        return measured
+
+    def stats(self):
+        """
+        :return: dict stage -> dict with count, total_us, mean_us, max_us and histogram
+        """
+        result = {}
+        for stage, (count, total, maximum, histogram) in self._stages.items():
+            result[stage] = {
+                "count": count,
+                "total_us": total / 1000,
+                "mean_us": total / count / 1000,
+                "max_us": maximum / 1000,
+                "histogram": list(histogram),
+            }
+        return result
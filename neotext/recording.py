@@ -0,0 +1,256 @@
+"""
+recording of the frames shown by NeoWrite into a binary file and playback of it,
+fixed content only needs to be rendered once, playing it back costs one buffer copy per frame
+
+file layout (little endian):
+    header: magic b"NTFR", version, bpp, flags, pixel order (4 bytes, unused ones 255), number of LEDs, fps (float)
+    frames: length of the frame data (uint32), frame data
+the frame data is the neopixel buffer as it is, or run length encoded as (count, value) byte pairs
+author: Sebastian Heiden
+"""
+
+import struct
+import time
+
+try:
+    import mmap
+except ImportError:
+    # no memory mapping on CircuitPython, the player reads the file instead
+    mmap = None
+
+MAGIC = b"NTFR"
+VERSION = 1
+FLAG_RLE = 0x01
+HEADER = struct.Struct("<4sBBB4sIf")
+FRAME_LENGTH = struct.Struct("<I")
+
+
+def rle_encode(data):
+    """
+    run length encode data into (count, value) byte pairs, count 1 to 255
+    :type data: bytes-like
+    :return: bytearray
+    """
+    encoded = bytearray()
+    index = 0
+    length = len(data)
+    while index < length:
+        value = data[index]
+        run = index + 1
+        while run < length and run - index < 255 and data[run] == value:
+            run += 1
+        encoded.append(run - index)
+        encoded.append(value)
+        index = run
+    return encoded
+
+
+def rle_decode(data, target):
+    """
+    decode (count, value) byte pairs into target
+    :type data: bytes-like run length encoded frame
+    :type target: bytearray, large enough for the decoded frame
+    :return: int number of decoded bytes
+    """
+    pos = 0
+    for index in range(0, len(data), 2):
+        count = data[index]
+        target[pos:pos + count] = bytes((data[index + 1],)) * count
+        pos += count
+    return pos
+
+
+class FrameRecorder:
+    """
+    writes every frame handed to add() into a recording file
+    """
+
+    def __init__(self, path, neopixels, fps=10.0, compress=True):
+        """
+        :type path: str file to write
+        :type neopixels: NeoPixel whose frames are recorded
+        :type fps: float frame rate for the playback
+        :type compress: bool run length encode the frames
+        """
+        assert fps > 0.0
+
+        self.frame_size = len(neopixels.buf)
+        self.compress = compress
+        self.frames = 0
+        self.bytes_written = 0
+        order = bytes(neopixels.order) + b"\xff" * (4 - len(neopixels.order))
+        self._file = open(path, "wb")
+        self._write(HEADER.pack(MAGIC, VERSION, neopixels.bpp, FLAG_RLE if compress else 0, order,
+                                len(neopixels), fps))
+
+    def _write(self, data):
+        self._file.write(data)
+        self.bytes_written += len(data)
+
+    def add(self, frame):
+        """
+        append one frame
+        :type frame: bytes-like content of the neopixel buffer
+        :return: None
+        """
+        assert len(frame) == self.frame_size
+
+        data = rle_encode(frame) if self.compress else frame
+        self._write(FRAME_LENGTH.pack(len(data)))
+        self._write(data)
+        self.frames += 1
+
+    def close(self):
+        """
+        finish the file
+        :return: None
+        """
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.close()
+
+
+class FramePlayer:
+    """
+    plays a recording file back into a NeoPixel, the file is memory mapped where possible
+    """
+
+    def __init__(self, path):
+        """
+        :type path: str recording file
+        """
+        self._file = open(path, "rb")
+        if mmap is not None:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._map = self._file.read()
+        self._data = memoryview(self._map)
+
+        magic, version, self.bpp, flags, order, self.n, self.fps = HEADER.unpack_from(self._data, 0)
+        assert magic == MAGIC, "not a neotext recording"
+        assert version == VERSION
+        self.order = tuple(channel for channel in order if channel != 0xff)
+        self.compressed = bool(flags & FLAG_RLE)
+        self.frame_size = self.n * self.bpp
+
+        # start and length of the data of each frame
+        self.frame_offsets = []
+        self.frame_lengths = []
+        pos = HEADER.size
+        while pos + FRAME_LENGTH.size <= len(self._data):
+            length = FRAME_LENGTH.unpack_from(self._data, pos)[0]
+            pos += FRAME_LENGTH.size
+            self.frame_offsets.append(pos)
+            self.frame_lengths.append(length)
+            pos += length
+
+    def __len__(self):
+        return len(self.frame_offsets)
+
+    def load_frame(self, index, neopixels):
+        """
+        copy frame index into the buffer of neopixels, without showing it
+        :type index: int number of the frame
+        :type neopixels: NeoPixel with the same number of LEDs and bpp as the recording
+        :return: None
+        """
+        assert len(neopixels.buf) == self.frame_size
+
+        start = self.frame_offsets[index]
+        data = self._data[start:start + self.frame_lengths[index]]
+        if self.compressed:
+            rle_decode(data, neopixels.buf)
+        else:
+            neopixels.buf[:] = data
+        # the CircuitPython driver has no mark_dirty, it sends the whole buffer anyway
+        mark_dirty = getattr(neopixels, "mark_dirty", None)
+        if mark_dirty is not None:
+            mark_dirty()
+
+    def play(self, neopixels, fps=None, loop=False):
+        """
+        show all frames at fps frames per second, frames running late are skipped
+        :type neopixels: NeoPixel with the same number of LEDs and bpp as the recording
+        :type fps: float or None for the frame rate of the recording
+        :type loop: bool start again after the last frame, until interrupted
+        :return: None
+        """
+        period = 1.0 / (fps or self.fps)
+        while True:
+            start = time.monotonic()
+            index = 0
+            while index < len(self):
+                self.load_frame(index, neopixels)
+                neopixels.show()
+
+                delay = start + (index + 1) * period - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                    index += 1
+                else:
+                    # continue with the frame, which is due now
+                    index = max(index + 1, int((time.monotonic() - start) / period))
+            if not loop:
+                return
+
+    def close(self):
+        """
+        release the file
+        :return: None
+        """
+        self._data.release()
+        if mmap is not None:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.close()
+
+
+def run_checks():
+    """
+    behavior checks: run length encoding and recordings round trip, needs CPython
+    :return: None
+    """
+    import os
+    import tempfile
+
+    import neopixel
+    import neotext as nt
+
+    # recordings play back the frames shown, with and without run length encoding
+    data = bytes(300) + b"\x01\x02\x02" + bytes(range(256))
+    target = bytearray(len(data))
+    assert rle_decode(rle_encode(data), target) == len(data)
+    assert target == data
+    path = os.path.join(tempfile.mkdtemp(), "check.ntfr")
+    for compress in (True, False):
+        neo = nt.NeoWrite(4, 0)
+        neo.record(path, compress=compress)
+        frames = []
+        neo.write("Hi", color=nt.Color(nt.COLORS.CYAN))
+        frames.append(bytes(neo.neopixels.buf))
+        for _ in range(5):
+            neo.scroll_by(-1)
+            frames.append(bytes(neo.neopixels.buf))
+        neo.stop_recording()
+        with FramePlayer(path) as player:
+            assert len(player) == len(frames)
+            output = neopixel.NeoPixel(None, player.n, bpp=player.bpp, auto_write=False)
+            for index, frame in enumerate(frames):
+                player.load_frame(index, output)
+                assert output.buf == frame
+    os.remove(path)
+    print("Recording checks passed!")
+
+
+if __name__ == "__main__":
+
+    run_checks()
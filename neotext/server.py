@@ -0,0 +1,284 @@
+"""
+render server for many signs under CPython: the NeoWrite instances of the signs live in worker processes,
+which rasterize and scroll them in parallel, their frames are put into shared memory
+the signs are addressed by name through the methods of SignServer
+
+    server = SignServer(workers=4)
+    server.add_sign("hall", num_tiles=4)
+    server.write("hall", "Welcome")
+    while True:
+        server.tick()
+        output.buf[:] = server.frame("hall")
+author: Sebastian Heiden
+"""
+
+import multiprocessing
+from multiprocessing import resource_tracker, shared_memory
+
+import neopixel
+import neotext as nt
+
+
+def _attach(name):
+    """
+    :type name: str name of shared memory created by the server
+    :return: SharedMemory, which is not unlinked by this process
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # before Python 3.13 every process tracks the memory it attaches to and unlinks it when it ends
+        shared = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shared._name, "shared_memory")  # pylint: disable=protected-access
+        return shared
+
+
+class SharedMemoryPixels(neopixel.NeoPixel):
+    """
+    NeoPixel chain, whose transmitted frames are copied into shared memory
+    """
+
+    def __init__(self, name, n, **kwargs):
+        """
+        :type name: str name of the shared memory of the frame, at least n * bpp bytes
+        :type n: int number of pixels
+        """
+        self.shared = _attach(name)
+        super().__init__(None, n, **kwargs)
+
+    def _transmit(self, wire, start):
+        self.shared.buf[start:len(wire)] = wire[start:]
+        super()._transmit(wire, start)
+
+    def deinit(self):
+        """Blank out the NeoPixels and release the shared memory."""
+        super().deinit()
+        self.shared.close()
+
+
+def _worker(connection):
+    """
+    main loop of a worker process: runs the commands of the server on its signs and answers each one
+    with None or the exception it raised
+    :param connection: Connection to the server
+    :return: None
+    """
+    signs = {}
+    while True:
+        command, name, args = connection.recv()
+        if command == "stop":
+            break
+        try:
+            if command == "add":
+                shared_name, num_tiles, tile_rows, orientation, tile_layout = args
+                output = SharedMemoryPixels(shared_name, num_tiles * tile_rows * 64, auto_write=False)
+                # the garbage collector of CPython runs by itself
+                signs[name] = nt.NeoWrite(num_tiles, output, orientation=orientation, gc_every=0,
+                                          tile_rows=tile_rows, tile_layout=tile_layout)
+            elif command == "remove":
+                signs.pop(name).deinit()
+            elif command == "write":
+                text, color, intensity, line = args
+                signs[name].write(text, nt.Color(color), intensity, line=line)
+            elif command == "clear":
+                signs[name].clear()
+            elif command == "scroll":
+                for neo in signs.values():
+                    neo.scroll_by(args[0])
+            connection.send(None)
+        except Exception as error:  # pylint: disable=broad-except
+            connection.send(error)
+
+    for neo in signs.values():
+        neo.deinit()
+    connection.close()
+
+
+class SignServer:
+    """
+    hosts the signs in a pool of worker processes, each sign belongs to one worker
+    commands are sent without waiting, so the workers run them in parallel, tick() and frame() wait until the
+    workers are done, errors of the commands are raised there
+    """
+
+    def __init__(self, workers=None):
+        """
+        :type workers: int number of worker processes, defaults to the number of CPUs
+        """
+        if workers is None:
+            workers = multiprocessing.cpu_count()
+        assert workers > 0
+
+        self.connections = []
+        self.processes = []
+        self.pending = [0] * workers  # commands sent to each worker, whose answers are not read yet
+        self.error = None  # first error answered since the last wait()
+        for _ in range(workers):
+            connection, worker_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_worker, args=(worker_connection,), daemon=True)
+            process.start()
+            worker_connection.close()
+            self.connections.append(connection)
+            self.processes.append(process)
+        self.signs = {}  # name -> (worker, SharedMemory, frame size in bytes)
+        self.frames = 0
+
+    def _send(self, worker, command, name=None, args=()):
+        connection = self.connections[worker]
+        # the answers are read while sending, else a worker blocks on a full pipe of answers,
+        # stops reading commands and the server blocks on a full pipe of commands
+        while self.pending[worker] and connection.poll():
+            self._receive(worker)
+        connection.send((command, name, args))
+        self.pending[worker] += 1
+
+    def _receive(self, worker):
+        answer = self.connections[worker].recv()
+        self.pending[worker] -= 1
+        if answer is not None and self.error is None:
+            self.error = answer
+
+    def wait(self):
+        """
+        wait until all commands sent so far are done
+        :return: None
+        """
+        for worker in range(len(self.connections)):
+            while self.pending[worker]:
+                self._receive(worker)
+        error = self.error
+        if error is not None:
+            self.error = None
+            raise error
+
+    def add_sign(self, name, num_tiles, tile_rows=1, orientation="ZIGZAG", tile_layout=None):
+        """
+        add a sign, it is given to the worker with the fewest signs
+        :type name: str name of the sign
+        :type num_tiles: int number of neopixel matrices in each row of the grid
+        :type tile_rows: int number of rows of matrices in the grid
+        :type orientation: str ZIGZAG or LINE
+        :type tile_layout: sequence of (tile_x, tile_y) positions of the matrices in the order of the chain
+        :return: None
+        """
+        assert name not in self.signs
+
+        load = [0] * len(self.connections)
+        for worker, _, _ in self.signs.values():
+            load[worker] += 1
+        worker = load.index(min(load))
+
+        size = num_tiles * tile_rows * 64 * 3
+        shared = shared_memory.SharedMemory(create=True, size=size)
+        self.signs[name] = (worker, shared, size)
+        self._send(worker, "add", name, (shared.name, num_tiles, tile_rows, orientation, tile_layout))
+
+    def remove_sign(self, name):
+        """
+        :type name: str name of the sign
+        :return: None
+        """
+        worker, shared, _ = self.signs.pop(name)
+        self._send(worker, "remove", name)
+        self.wait()
+        shared.close()
+        shared.unlink()
+
+    def write(self, name, text, color=nt.Color(nt.COLORS.WHITE), intensity=5, line=0):
+        """
+        write text on the sign name, see NeoWrite.write
+        :return: None
+        """
+        self._send(self.signs[name][0], "write", name, (text, color.to_int(), intensity, line))
+
+    def clear(self, name):
+        """
+        clear the sign name
+        :return: None
+        """
+        self._send(self.signs[name][0], "clear", name)
+
+    def tick(self, step=-1):
+        """
+        scroll all signs by step columns, the workers render their signs in parallel
+        :param step: int columns, negative to the left, positive to the right
+        :return: None
+        """
+        for worker in range(len(self.connections)):
+            self._send(worker, "scroll", None, (step,))
+        self.wait()
+        self.frames += 1
+
+    def frame(self, name):
+        """
+        :type name: str name of the sign
+        :return: memoryview of the last frame of the sign in shared memory, wire order of the dummy neopixel,
+                 to be released before the sign is removed
+        """
+        self.wait()
+        _, shared, size = self.signs[name]
+        return shared.buf[:size]
+
+    def close(self):
+        """
+        stop the workers and release the shared memory
+        :return: None
+        """
+        for connection in self.connections:
+            connection.send(("stop", None, ()))
+        for process in self.processes:
+            process.join()
+        for connection in self.connections:
+            connection.close()
+        for _, shared, _ in self.signs.values():
+            shared.close()
+            shared.unlink()
+        self.signs = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.close()
+
+
+def run_checks():
+    """
+    behavior checks: frames of the server equal the ones of a local NeoWrite, errors reach the caller and
+    many commands without waiting do not block, needs CPython
+    :return: None
+    """
+    local = {"hall": nt.NeoWrite(2, 0), "door": nt.NeoWrite(1, 0, tile_rows=2)}
+    with SignServer(workers=2) as server:
+        server.add_sign("hall", num_tiles=2)
+        server.add_sign("door", num_tiles=1, tile_rows=2)
+        for name, text, line in (("hall", "Welcome", 0), ("door", "Up", 1)):
+            server.write(name, text, nt.Color(nt.COLORS.GREEN), 10, line=line)
+            local[name].write(text, nt.Color(nt.COLORS.GREEN), 10, line=line)
+        for _ in range(10):
+            server.tick()
+            for neo in local.values():
+                neo.scroll_by(-1)
+            for name, neo in local.items():
+                frame = server.frame(name)
+                assert bytes(frame) == bytes(neo.neopixels._front), name
+                frame.release()
+
+        server.write("hall", "x", line=1)
+        try:
+            server.wait()
+        except AssertionError:
+            pass
+        else:
+            assert False, "the error of the worker is raised"
+
+        for _ in range(3000):
+            server.clear("hall")
+        server.wait()
+        assert not any(server.frame("hall"))
+    print("Server checks passed!")
+
+
+if __name__ == "__main__":
+
+    run_checks()
@@ -0,0 +1,141 @@
+"""
+one logical chain of neopixels, driven by several pins
+the chain is cut into shards, one NeoPixel object per pin, which are transmitted at the same time
+author: Sebastian Heiden
+"""
+
+import neopixel
+
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    # CircuitPython has no threads, the shards are transmitted one after the other
+    ThreadPoolExecutor = None
+
+
+def _show_shard(shard):
+    shard.show()
+
+
+class ShardedNeoPixel(neopixel.NeoPixel):
+    """
+    NeoPixel chain of n pixels, split into shards of counts[i] pixels on pins[i]
+    the pixels are written into one buffer like a single chain, show() copies the changed bytes into
+    the shards, transmits them concurrently and returns after all shards are done
+    """
+
+    def __init__(self, pins, n, *, bpp=3, brightness=1.0, auto_write=True, pixel_order=None, counts=None):
+        """
+        :type pins: sequence of pins, one per shard
+        :type n: int number of pixels of all shards together
+        :type counts: sequence of int number of pixels of each shard, defaults to an even split
+        """
+        assert len(pins) > 0
+        if counts is None:
+            counts = [n // len(pins) + (index < n % len(pins)) for index in range(len(pins))]
+        assert len(counts) == len(pins)
+        assert sum(counts) == n
+
+        self.shards = [neopixel.NeoPixel(pin, count, bpp=bpp, brightness=brightness, auto_write=False,
+                                         pixel_order=pixel_order)
+                       for pin, count in zip(pins, counts)]
+        super().__init__(pins[0], n, bpp=bpp, brightness=brightness, auto_write=auto_write,
+                         pixel_order=pixel_order)
+
+        # byte offset of each shard in buf
+        self.shard_offsets = []
+        offset = 0
+        for shard in self.shards:
+            self.shard_offsets.append(offset)
+            offset += len(shard.buf)
+
+        if ThreadPoolExecutor is not None and len(self.shards) > 1:
+            self._pool = ThreadPoolExecutor(max_workers=len(self.shards))
+        else:
+            self._pool = None
+
+    def deinit(self):
+        """Blank out the NeoPixels of all shards and release the pins."""
+        super().deinit()
+        for shard in self.shards:
+            shard.deinit()
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    @property
+    def brightness(self):
+        """Overall brightness of the pixel"""
+        return self._brightness
+
+    @brightness.setter
+    def brightness(self, brightness):
+        for shard in self.shards:
+            shard.brightness = brightness
+        neopixel.NeoPixel.brightness.fset(self, brightness)
+
+    def show(self):
+        """Copies the changed bytes into their shards and transmits all changed shards at the
+        same time. Returns after every shard has been transmitted."""
+        start = self._dirty_start
+        stop = self._dirty_stop
+        self._dirty_start = len(self.buf)
+        self._dirty_stop = 0
+        self._retransmit = False
+
+        changed = []
+        for shard, offset in zip(self.shards, self.shard_offsets):
+            shard_start = max(start, offset)
+            shard_stop = min(stop, offset + len(shard.buf))
+            if shard_start < shard_stop:
+                shard.buf[shard_start - offset:shard_stop - offset] = self.buf[shard_start:shard_stop]
+                if hasattr(shard, "mark_dirty"):
+                    shard.mark_dirty(shard_start - offset, shard_stop - offset)
+                changed.append(shard)
+
+        if not changed:
+            self.frames_suppressed += 1
+            return
+
+        if self._pool is not None and len(changed) > 1:
+            # the list waits for every shard, it is the barrier of the frame
+            list(self._pool.map(_show_shard, changed))
+        else:
+            for shard in changed:
+                shard.show()
+        self.frames_sent += 1
+        self.bytes_sent = sum(shard.bytes_sent for shard in self.shards)
+        if self.emulator is not None:
+            # the whole chain as transmitted by the shards
+            wire = self.buf[:stop]
+            if self._brightness_table is not None:
+                wire = wire.translate(self._brightness_table)
+            self.emulator.receive(wire)
+
+
+def run_checks():
+    """
+    behavior checks: a NeoWrite on several pins transmits the same chain as on one pin
+    :return: None
+    """
+    import neotext as nt
+
+    sharded = nt.NeoWrite(4, [1, 2, 3])
+    single = nt.NeoWrite(4, 0)
+    assert [len(shard) for shard in sharded.neopixels.shards] == [128, 64, 64]
+    for neo in (sharded, single):
+        neo.write("Sharded!", intensity=40)
+    for _ in range(12):
+        for neo in (sharded, single):
+            neo.scroll_by(-1)
+        # the shards hold the transmitted frame in their front buffers
+        frame = b"".join(bytes(shard._front) for shard in sharded.neopixels.shards)
+        assert frame == bytes(single.neopixels._front)
+    sharded.deinit()
+    single.deinit()
+    print("Sharded checks passed!")
+
+
+if __name__ == "__main__":
+
+    run_checks()
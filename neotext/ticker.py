@@ -0,0 +1,148 @@
+"""
+ticker mode of NeoWrite: scrolls an endless feed of text chunks from right to left
+the glyph columns are rendered one by one, when they enter the display, and are overwritten
+when they leave it, so the RAM needed does not depend on the length of the feed
+author: Sebastian Heiden
+"""
+
+import time
+
+import font as f
+import neotext as nt
+
+
+class Ticker:
+    """
+    the visible columns are kept in a ring of num_columns canvas columns, which NeoWrite shows
+    as its canvas with the viewport at the oldest column
+    scroll_by() has the interface animation.Animator expects, so a Ticker can be animated like a NeoWrite
+    """
+
+    def __init__(self, neo, chunks, color=nt.Color(nt.COLORS.WHITE), intensity=5, font=f.DEFAULT_FONT, line=0):
+        """
+        :type neo: NeoWrite display, the ticker takes it over and clears it
+        :param chunks: iterable of strings, e.g. a generator of news or log lines, may be endless
+        :type color: Color color of the text
+        :type intensity: int max. intensity for each LED
+        :type font: Font bitmap font of the text
+        :type line: int row of matrices to write into, 0 is the top row
+        """
+        assert intensity >= 0
+        assert intensity <= 100
+        assert 0 <= line < neo.num_rows // 8
+
+        neo.clear()
+        self.neo = neo
+        self.font = font
+        self.line = line
+        self._columns = self._glyph_columns(iter(chunks))
+        self.ring = bytearray(neo.num_columns * neo.column_bytes)
+        self.head = 0  # ring column for the next glyph column, the oldest visible one
+        self.columns_shown = 0
+        self.blank_columns = 0  # columns shown since the feed ended
+        self.done = False
+
+        self.pixel = bytearray(neo.neopixels.bpp)
+        for channel, value in zip(neo.neopixels.order, nt.Color.intensity(color, intensity)):
+            self.pixel[channel] = value
+
+        neo.canvas = self.ring
+        neo.max_x = neo.num_columns
+
+    def _glyph_columns(self, chunks):
+        """
+        generator of the column bitmasks of the text, one glyph after the other
+        :param chunks: iterator of strings
+        :return: int column bitmask, bit y is row y of the line
+        """
+        font = self.font
+        for chunk in chunks:
+            for letter in chunk:
+                code = font.index(letter)
+                if code < 0:
+                    continue
+                start = font.starts[code]
+                width = font.widths[code]
+                for column in range(font.advances[code]):
+                    yield font.columns[start + column] if column < width else 0
+
+    def _next_column(self):
+        """
+        render the next glyph column into the ring, in place of the column leaving the display
+        :return: None
+        """
+        mask = next(self._columns, None)
+        if mask is None:
+            mask = 0
+            self.blank_columns = self.blank_columns + 1
+            self.done = self.blank_columns >= self.neo.num_columns
+
+        neo = self.neo
+        bpp = neo.neopixels.bpp
+        column = self.head * neo.column_bytes
+        self.ring[column:column + neo.column_bytes] = neo.zero_column
+        # canvas rows are stored from bottom to top
+        bottom = column + (neo.num_rows - 1 - self.line * 8) * bpp
+        row = 0
+        while mask:
+            if mask & 1:
+                pos = bottom - row * bpp
+                self.ring[pos:pos + bpp] = self.pixel
+            mask = mask >> 1
+            row = row + 1
+
+        self.head = (self.head + 1) % neo.num_columns
+        self.columns_shown = self.columns_shown + 1
+
+    def scroll_by(self, step=-1):
+        """
+        move the feed by -step columns to the left and show it
+        :param step: int columns, only negative steps (to the left) are possible
+        :return: None
+        """
+        assert step <= 0, "the ticker only scrolls to the left"
+
+        for _ in range(-step):
+            self._next_column()
+        self.neo.view_x = self.head
+        self.neo._render_view()
+        self.neo._show()
+
+    def run(self, time_step=0.1):
+        """
+        scroll the feed until it has left the display completely, for async use animation.Animator
+        :param time_step: float time in seconds between two steps
+        :return: None
+        """
+        while not self.done:
+            self.scroll_by(-1)
+            time.sleep(time_step)
+
+
+def run_checks():
+    """
+    behavior checks: a Ticker shows the same frames as NeoWrite scrolling the whole text in from the right
+    :return: None
+    """
+    import layout
+
+    text = "Hello World"
+    feed = Ticker(nt.NeoWrite(2, 0), ("Hel", "lo Wo", "", "rld"), color=nt.Color(nt.COLORS.GREEN))
+    neo = nt.NeoWrite(2, 0)
+    # spaces of the default font are one column wide, the text starts right of the display
+    neo.write(" " * neo.num_columns + text, color=nt.Color(nt.COLORS.GREEN))
+    for _ in range(layout.measure(text)):
+        feed.scroll_by(-1)
+        neo.scroll_by(-1)
+        assert feed.neo.neopixels.buf == neo.neopixels.buf, feed.columns_shown
+    assert len(feed.ring) == neo.num_columns * neo.column_bytes
+
+    while not feed.done:
+        feed.scroll_by(-1)
+    assert not any(feed.neo.neopixels.buf)
+    print("Ticker checks passed!")
+
+
+if __name__ == "__main__":
+
+    run_checks()